@@ -0,0 +1,122 @@
+"""
+Session 12 - Workshop 1: Per-Applicant State Store
+Checkpoints each pipeline stage so batches can resume after a crash
+
+Features:
+1. State keyed by applicant id, so concurrent applications never collide
+2. One checkpoint row per (applicant, stage) in SQLite
+3. A restarted batch skips every stage that already completed
+4. Each checkpoint remembers a fingerprint of its inputs and how many
+   LLM calls it cost, so a stage re-runs only when its inputs change
+
+Usage:
+    store = ApplicationStateStore("admission_state.sqlite")
+    store.save_stage("sarah.johnson@email.com", "extracted_data", extracted)
+    store.load_stage("sarah.johnson@email.com", "extracted_data")
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+
+def fingerprint(value) -> str:
+    """Stable hash of a stage's inputs (any JSON-serialisable value)"""
+    payload = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ApplicationStateStore:
+    """
+    Stage outputs per applicant. Use ":memory:" for a throwaway store
+    (isolation only) or a file path to survive restarts.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS stage_checkpoints (
+                   applicant_id TEXT NOT NULL,
+                   stage TEXT NOT NULL,
+                   output TEXT NOT NULL,
+                   completed_at TEXT NOT NULL,
+                   input_hash TEXT,
+                   llm_calls INTEGER NOT NULL DEFAULT 0,
+                   PRIMARY KEY (applicant_id, stage)
+               )"""
+        )
+        # Stores created before input tracking get the new columns
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(stage_checkpoints)")}
+        if "input_hash" not in columns:
+            self._conn.execute("ALTER TABLE stage_checkpoints ADD COLUMN input_hash TEXT")
+        if "llm_calls" not in columns:
+            self._conn.execute("ALTER TABLE stage_checkpoints ADD COLUMN llm_calls INTEGER NOT NULL DEFAULT 0")
+        self._conn.commit()
+
+    def save_stage(self, applicant_id: str, stage: str, output,
+                   input_hash: str = None, llm_calls: int = 0):
+        """Checkpoint one stage's output (committed immediately)"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO stage_checkpoints "
+                "(applicant_id, stage, output, completed_at, input_hash, llm_calls) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (applicant_id, stage, json.dumps(output), datetime.now().isoformat(),
+                 input_hash, llm_calls)
+            )
+            self._conn.commit()
+
+    def load_checkpoint(self, applicant_id: str, stage: str):
+        """{"output", "input_hash", "llm_calls"} for a completed stage, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT output, input_hash, llm_calls FROM stage_checkpoints "
+                "WHERE applicant_id = ? AND stage = ?",
+                (applicant_id, stage)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"output": json.loads(row[0]), "input_hash": row[1], "llm_calls": row[2]}
+
+    def load_stage(self, applicant_id: str, stage: str):
+        """Return a stage's checkpointed output, or None if it has not completed"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT output FROM stage_checkpoints WHERE applicant_id = ? AND stage = ?",
+                (applicant_id, stage)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get(self, applicant_id: str) -> dict:
+        """All checkpointed stage outputs for one applicant"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT stage, output FROM stage_checkpoints WHERE applicant_id = ?",
+                (applicant_id,)
+            ).fetchall()
+        return {stage: json.loads(output) for stage, output in rows}
+
+    def completed_stages(self, applicant_id: str) -> list:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT stage FROM stage_checkpoints WHERE applicant_id = ? ORDER BY completed_at",
+                (applicant_id,)
+            ).fetchall()
+        return [stage for (stage,) in rows]
+
+    def clear(self, applicant_id: str = None):
+        """Forget one applicant, or everything when applicant_id is None"""
+        with self._lock:
+            if applicant_id is None:
+                self._conn.execute("DELETE FROM stage_checkpoints")
+            else:
+                self._conn.execute("DELETE FROM stage_checkpoints WHERE applicant_id = ?", (applicant_id,))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
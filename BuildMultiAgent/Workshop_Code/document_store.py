@@ -0,0 +1,97 @@
+"""
+Session 12 - Workshop 1: Document Extraction Store
+Extract each distinct document once, across applicants and runs
+
+Features:
+1. Documents hashed after normalising whitespace and Unicode form
+2. Extraction results stored per (document type, content, extractor settings)
+3. Persistent SQLite store shared by every applicant and batch
+4. Reuse counters per document (e.g. a teacher's shared letter)
+
+Usage:
+    store = DocumentStore("document_extractions.sqlite")
+    processor = DocumentProcessorAgent(llm, document_store=store)
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import unicodedata
+from datetime import datetime
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_document(content: str) -> str:
+    """Unicode NFC, whitespace runs collapsed, ends stripped"""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", content)).strip()
+
+
+def document_hash(doc_type: str, content: str, signature: str = "") -> str:
+    """
+    Content address of one extraction. signature captures extractor
+    settings (model, chunking, ...) that change the result for the same text.
+    """
+    payload = json.dumps([doc_type, signature, normalize_document(content)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DocumentStore:
+    """Extraction results keyed by document hash in a local SQLite file"""
+
+    def __init__(self, path: str = "document_extractions.sqlite"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS document_extractions (
+                   doc_hash TEXT PRIMARY KEY,
+                   doc_type TEXT NOT NULL,
+                   output TEXT NOT NULL,
+                   created_at TEXT NOT NULL,
+                   reuse_count INTEGER NOT NULL DEFAULT 0
+               )"""
+        )
+        self._conn.commit()
+
+    def get(self, doc_hash: str):
+        """Stored extraction for a document hash (counted as a reuse), or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT output FROM document_extractions WHERE doc_hash = ?", (doc_hash,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE document_extractions SET reuse_count = reuse_count + 1 WHERE doc_hash = ?",
+                (doc_hash,)
+            )
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, doc_hash: str, doc_type: str, output):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO document_extractions (doc_hash, doc_type, output, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (doc_hash, doc_type, json.dumps(output), datetime.now().isoformat())
+            )
+            self._conn.commit()
+
+    def counts(self) -> dict:
+        """Stored documents and total reuses per document type"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT doc_type, COUNT(*), SUM(reuse_count) FROM document_extractions GROUP BY doc_type"
+            ).fetchall()
+        return {doc_type: {"documents": count, "reuses": reuses} for doc_type, count, reuses in rows}
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM document_extractions").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
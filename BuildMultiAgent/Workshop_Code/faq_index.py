@@ -0,0 +1,243 @@
+"""
+Session 12 - Workshop 1: FAQ Inverted Index
+BM25 search over the admissions FAQ for the Query Handler Agent
+
+Features:
+1. Tokenized inverted index with BM25 scoring and top-k results
+2. Light stemming and admissions synonyms ("cost" finds "fee")
+3. Loads entries from JSON or CSV files
+4. Incremental updates: only added/changed/removed entries are re-indexed
+
+Usage:
+    index = FAQIndex.from_file("workshop1_sample_data/faq.json")
+    index.search("how much does it cost to apply?", k=3)
+"""
+
+import csv
+import json
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+# Program codes are kept even when they collide with a stopword ("ME"
+# vs "me"); they count only when written in upper case
+PROGRAM_CODES = {
+    "CS": "computer science",
+    "EE": "electrical engineering",
+    "ME": "mechanical engineering",
+}
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "can", "do", "does", "for", "from", "how",
+    "i", "if", "in", "is", "it", "me", "my", "of", "on", "or", "the", "there", "to", "what",
+    "when", "where", "which", "who", "will", "with", "you", "your", "about", "tell", "please",
+    "much", "many", "per"
+}
+
+# Applied to queries and entries alike. Only words that mean the target in
+# any admissions question: "score", "date", "much" or "course" would send
+# "what essay score do I need?" to the GPA answer without the model, and
+# "tuition" is the yearly program fee, not the application fee.
+SYNONYMS = {
+    "due": "deadline", "cutoff": "deadline",
+    "cost": "fee", "price": "fee", "charge": "fee",
+    "dorm": "housing", "hostel": "housing", "accommodation": "housing",
+    "grant": "scholarship", "funding": "scholarship",
+    "major": "program", "degree": "program",
+    "paperwork": "document",
+}
+
+# (suffix, replacement), longest first
+_SUFFIXES = (("sses", "ss"), ("ies", "y"), ("ing", ""), ("ed", ""), ("ly", ""), ("s", ""))
+
+
+def stem(token: str) -> str:
+    """Tiny suffix-stripping stemmer; good enough for short FAQ text"""
+    for suffix, replacement in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) + len(replacement) >= 3:
+            if suffix == "s" and token.endswith("ss"):
+                continue
+            return token[: len(token) - len(suffix)] + replacement
+    return token
+
+
+# Synonym keys and targets in stemmed form, to match tokenize's output
+_STEMMED_SYNONYMS = {stem(word): stem(target) for word, target in SYNONYMS.items()}
+
+
+def tokenize(text: str) -> list:
+    """Lowercase, split, drop stopwords (but not program codes), stem, map synonyms"""
+    tokens = []
+    for word in _WORD_RE.findall(text):
+        token = word.lower()
+        if word in PROGRAM_CODES:
+            tokens.append(token)
+            continue
+        if token in STOPWORDS:
+            continue
+        token = stem(token)
+        tokens.append(_STEMMED_SYNONYMS.get(token, token))
+    return tokens
+
+
+def entities(text: str) -> frozenset:
+    """
+    Tokens that change the answer however similar the rest of the text
+    is: program codes (or full program names) and numbers
+    """
+    found = {code for code in PROGRAM_CODES if re.search(rf"\b{code}\b", text)}
+    lowered = text.lower()
+    found.update(code for code, name in PROGRAM_CODES.items() if name in lowered)
+    found.update(_NUMBER_RE.findall(text))
+    return frozenset(found)
+
+
+class FAQIndex:
+    """
+    Inverted index over FAQ entries (key -> answer, optional question).
+    The key is indexed twice so an entry's topic outweighs its wording.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.entries = {}                  # key -> {"question": ..., "answer": ...}
+        self._postings = defaultdict(dict)  # term -> {key: term frequency}
+        self._lengths = {}                 # key -> document length in tokens
+        self._total_length = 0
+        self._lock = threading.Lock()
+        self.version = 0                   # bumped on every change
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _document_tokens(self, key: str, entry: dict) -> list:
+        key_tokens = tokenize(key.replace("_", " "))
+        return key_tokens * 2 + tokenize(entry.get("question", "")) + tokenize(entry["answer"])
+
+    def _unindex(self, key: str):
+        entry = self.entries.pop(key)
+        for term in set(self._document_tokens(key, entry)):
+            postings = self._postings[term]
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(key)
+
+    def upsert(self, key: str, answer: str, question: str = "") -> bool:
+        """Add or replace one entry; returns False if it was already identical"""
+        entry = {"question": question, "answer": answer}
+        with self._lock:
+            if self.entries.get(key) == entry:
+                return False
+            if key in self.entries:
+                self._unindex(key)
+            tokens = self._document_tokens(key, entry)
+            for term, frequency in Counter(tokens).items():
+                self._postings[term][key] = frequency
+            self.entries[key] = entry
+            self._lengths[key] = len(tokens)
+            self._total_length += len(tokens)
+            self.version += 1
+            return True
+
+    def remove(self, key: str) -> bool:
+        with self._lock:
+            if key not in self.entries:
+                return False
+            self._unindex(key)
+            self.version += 1
+            return True
+
+    def sync(self, entries: dict) -> dict:
+        """
+        Make the index match entries (key -> answer, or key -> {"question", "answer"}),
+        touching only what changed. Returns counts of added/updated/removed.
+        """
+        changes = {"added": 0, "updated": 0, "removed": 0}
+        for key in [key for key in self.entries if key not in entries]:
+            self.remove(key)
+            changes["removed"] += 1
+        for key, value in entries.items():
+            if isinstance(value, dict):
+                answer, question = value["answer"], value.get("question", "")
+            else:
+                answer, question = value, ""
+            existed = key in self.entries
+            if self.upsert(key, answer, question):
+                changes["updated" if existed else "added"] += 1
+        return changes
+
+    def search(self, query: str, k: int = 3) -> list:
+        """Top-k (key, answer, score) by BM25, best first; empty if nothing matches"""
+        terms = tokenize(query)
+        with self._lock:
+            count = len(self.entries)
+            if not count or not terms:
+                return []
+            average_length = self._total_length / count
+            scores = defaultdict(float)
+            for term in set(terms):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log((count - len(postings) + 0.5) / (len(postings) + 0.5) + 1)
+                for key, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[key] / average_length)
+                    scores[key] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+            return [(key, self.entries[key]["answer"], round(score, 4)) for key, score in ranked]
+
+    def topic_match(self, query: str, key: str) -> bool:
+        """
+        Whether the query names the entry's topic, not just words from its
+        answer: a key term, or a question term no other entry's question uses
+        ("need" and "apply" appear in several questions and say nothing).
+        """
+        with self._lock:
+            if key not in self.entries:
+                return False
+            questions = {other: set(tokenize(entry.get("question", "")))
+                         for other, entry in self.entries.items()}
+        shared = set().union(*(terms for other, terms in questions.items() if other != key))
+        topic = set(tokenize(key.replace("_", " "))) | (questions[key] - shared)
+        return bool(topic & set(tokenize(query)))
+
+    @staticmethod
+    def read_file(path: str) -> dict:
+        """
+        Read FAQ entries from JSON ({key: answer} or a list of
+        {"key", "question", "answer"}) or CSV (key,question,answer columns)
+        """
+        if path.lower().endswith(".csv"):
+            with open(path, newline="") as f:
+                rows = list(csv.DictReader(f))
+        else:
+            with open(path, "r") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                return data
+            rows = data
+        return {
+            row["key"]: {"question": row.get("question") or "", "answer": row["answer"]}
+            for row in rows
+        }
+
+    def load_file(self, path: str) -> dict:
+        """Incrementally sync the index with a JSON/CSV file"""
+        return self.sync(self.read_file(path))
+
+    @classmethod
+    def from_entries(cls, entries: dict) -> "FAQIndex":
+        index = cls()
+        index.sync(entries)
+        return index
+
+    @classmethod
+    def from_file(cls, path: str) -> "FAQIndex":
+        return cls.from_entries(cls.read_file(path))
@@ -0,0 +1,220 @@
+"""
+Session 12 - Shared: Content-Addressed LLM Response Cache
+Used by Workshop 1 (admissions) and Workshop 2 (learning paths)
+
+Features:
+1. Cache key = hash of model, temperature, stop sequences and prompt
+2. In-memory LRU tier for hot prompts
+3. Persistent SQLite tier that survives restarts
+4. Size- and TTL-based eviction on both tiers
+5. Hit/miss counters
+
+Usage:
+    llm = Ollama(model="llama3.2", temperature=0.7)
+    cached = CachedLLM(llm, disk_cache=SQLiteCache("llm_cache.sqlite"))
+    cached.invoke(prompt)    # pays inference once
+    cached.invoke(prompt)    # served from memory
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from structured_output import with_llm_options
+
+
+def llm_cache_key(llm, prompt: str, stop: list = None) -> str:
+    """Content address for one generation: model + sampling params + prompt"""
+    if stop is None:
+        stop = getattr(llm, "stop", None)
+    payload = json.dumps({
+        "model": getattr(llm, "model", None),
+        "temperature": getattr(llm, "temperature", None),
+        "stop": list(stop) if stop else None,
+        "format": getattr(llm, "format", None),
+        "prompt": prompt
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """
+    In-memory tier: least-recently-used eviction once max_entries is
+    reached, optional TTL in seconds
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (created_at, response)
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created_at, response = entry
+            if self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def set(self, key: str, response: str):
+        with self._lock:
+            self._entries[key] = (time.time(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """
+    Persistent tier: one row per key in a local SQLite file.
+    Rows older than ttl_seconds are ignored and purged; beyond max_entries
+    the least recently used rows are evicted.
+    """
+
+    def __init__(self, path: str = "llm_cache.sqlite", max_entries: int = 50000,
+                 ttl_seconds: float = 7 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_cache (
+                   key TEXT PRIMARY KEY,
+                   response TEXT NOT NULL,
+                   created_at REAL NOT NULL,
+                   last_access REAL NOT NULL
+               )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_access ON llm_cache (last_access)")
+        self._conn.commit()
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return response
+
+    def set(self, key: str, response: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, response, now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        """Drop expired rows, then the least recently used beyond max_entries"""
+        if self.ttl_seconds is not None:
+            self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedLLM:
+    """
+    Wraps the shared Ollama instance with a two-tier response cache.
+    Exposes the same invoke(prompt) call the agents already use, so an agent
+    opts in simply by being handed the wrapper instead of the raw LLM.
+    """
+
+    def __init__(self, llm, memory_cache: LRUCache = None, disk_cache: SQLiteCache = None):
+        self.llm = llm
+        self.memory_cache = memory_cache if memory_cache is not None else LRUCache()
+        self.disk_cache = disk_cache
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    def __getattr__(self, name):
+        # model, temperature, base_url, ... come from the wrapped LLM
+        return getattr(self.llm, name)
+
+    def _count(self, counter: str):
+        with self._lock:
+            self.stats[counter] += 1
+
+    def bind_options(self, **options):
+        """Same caches and counters over a copy of the LLM with other options (e.g. format="json")"""
+        bound = CachedLLM(with_llm_options(self.llm, **options), self.memory_cache, self.disk_cache)
+        bound.stats = self.stats
+        bound._lock = self._lock
+        return bound
+
+    def invoke(self, prompt: str, stop: list = None, **kwargs) -> str:
+        key = llm_cache_key(self.llm, prompt, stop)
+
+        response = self.memory_cache.get(key)
+        if response is not None:
+            self._count("memory_hits")
+            return response
+
+        if self.disk_cache is not None:
+            response = self.disk_cache.get(key)
+            if response is not None:
+                self._count("disk_hits")
+                self.memory_cache.set(key, response)
+                return response
+
+        self._count("misses")
+        if stop is not None:
+            kwargs["stop"] = stop
+        response = self.llm.invoke(prompt, **kwargs)
+        self.memory_cache.set(key, response)
+        if self.disk_cache is not None:
+            self.disk_cache.set(key, response)
+        return response
+
+    def hit_rate(self) -> float:
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.stats['memory_hits']} memory hits, {self.stats['disk_hits']} disk hits, "
+                f"{self.stats['misses']} misses ({self.hit_rate():.0%} hit rate)")
@@ -0,0 +1,173 @@
+"""
+Session 12 - Shared: Record/Replay Cassettes for LLM Calls
+Run Workshop 1 and Workshop 2 end to end without a live model
+
+Features:
+1. Record mode: every prompt → response pair is appended to a JSONL
+   cassette, with its latency and Ollama's eval counters
+2. Replay mode: responses are served from the cassette, instantly or
+   with the recorded latency
+3. Auto mode: replay what is on the cassette, record what is not
+4. A real LangChain LLM, so the ReAct agents can use it too
+
+Usage:
+    llm = CassetteLLM.wrap(Ollama(model="llama3.2"), "run.cassette.jsonl", mode="record")
+    ...run the system once against Ollama...
+    llm = CassetteLLM.wrap(Ollama(model="llama3.2"), "run.cassette.jsonl", mode="replay")
+    ...same run, no model needed...
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, List, Optional
+
+from langchain_core.language_models.llms import LLM
+from langchain_core.outputs import Generation, LLMResult
+
+from llm_cache import llm_cache_key
+from structured_output import with_llm_options
+
+CASSETTE_MODES = ("record", "replay", "auto")
+
+# Attributes read through to the live LLM (cache keys, base URL lookups)
+_FORWARDED = ("model", "temperature", "format", "stop", "base_url")
+
+_STATS_LOCK = threading.Lock()
+
+# Ollama generation info worth keeping (the full response also carries the token context)
+_INFO_KEYS = ("total_duration", "load_duration", "prompt_eval_count",
+              "prompt_eval_duration", "eval_count", "eval_duration")
+
+
+class CassetteMiss(KeyError):
+    """Replay mode was asked for a prompt that was never recorded"""
+
+
+class Cassette:
+    """
+    Recorded interactions, keyed like the response cache (model, sampling
+    options, stop sequences, prompt). A prompt recorded several times is
+    replayed in recording order, cycling when the replay asks for more.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries = {}   # key -> [interaction, ...]
+        self._cursors = {}   # key -> next index to replay
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        interaction = json.loads(line)
+                        self._entries.setdefault(interaction["key"], []).append(interaction)
+
+    def __len__(self):
+        return sum(len(interactions) for interactions in self._entries.values())
+
+    def __contains__(self, key: str):
+        return key in self._entries
+
+    def play(self, key: str):
+        """Next recorded interaction for key, or None"""
+        with self._lock:
+            interactions = self._entries.get(key)
+            if not interactions:
+                return None
+            index = self._cursors.get(key, 0)
+            self._cursors[key] = index + 1
+            return interactions[index % len(interactions)]
+
+    def record(self, interaction: dict):
+        with self._lock:
+            self._entries.setdefault(interaction["key"], []).append(interaction)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(interaction) + "\n")
+
+
+class CassetteLLM(LLM):
+    """
+    LangChain LLM in front of the live one. Replay never touches the
+    wrapped LLM, so it only needs to be constructible (Ollama connects
+    lazily).
+    """
+
+    llm: Any
+    cassette: Any
+    mode: str = "replay"
+    replay_latency: bool = False
+    stats: dict = None
+
+    @classmethod
+    def wrap(cls, llm, path: str, mode: str = "replay", replay_latency: bool = False) -> "CassetteLLM":
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode {mode}; use one of {', '.join(CASSETTE_MODES)}")
+        return cls(llm=llm, cassette=Cassette(path), mode=mode, replay_latency=replay_latency,
+                   stats={"replayed": 0, "recorded": 0})
+
+    @property
+    def _llm_type(self) -> str:
+        return "cassette"
+
+    def __getattr__(self, name):
+        if name in _FORWARDED:
+            return getattr(self.__dict__["llm"], name, None)
+        raise AttributeError(name)
+
+    def bind_options(self, **options):
+        """Same cassette over a copy of the live LLM with other options (e.g. format="json")"""
+        return CassetteLLM(llm=with_llm_options(self.llm, **options), cassette=self.cassette,
+                           mode=self.mode, replay_latency=self.replay_latency, stats=self.stats)
+
+    def _count(self, counter: str):
+        with _STATS_LOCK:
+            self.stats[counter] += 1
+
+    def _play(self, prompt: str, stop: Optional[List[str]] = None, **kwargs) -> dict:
+        key = llm_cache_key(self.llm, prompt, stop)
+        if self.mode != "record":
+            interaction = self.cassette.play(key)
+            if interaction is not None:
+                self._count("replayed")
+                if self.replay_latency:
+                    time.sleep(interaction["latency_s"])
+                return interaction
+            if self.mode == "replay":
+                raise CassetteMiss(f"No recording for prompt: {prompt[:80]!r}")
+
+        start = time.perf_counter()
+        if hasattr(self.llm, "generate"):
+            generation = self.llm.generate([prompt], stop=stop, **kwargs).generations[0][0]
+            text, info = generation.text, generation.generation_info or {}
+        else:
+            text, info = self.llm.invoke(prompt, stop=stop, **kwargs), {}
+        interaction = {
+            "key": key,
+            "model": getattr(self.llm, "model", None),
+            "prompt": prompt,
+            "response": text,
+            "latency_s": round(time.perf_counter() - start, 4),
+            "info": {name: info[name] for name in _INFO_KEYS if name in info},
+            "recorded_at": time.time(),
+        }
+        self.cassette.record(interaction)
+        self._count("recorded")
+        return interaction
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> str:
+        return self._play(prompt, stop=stop, **kwargs)["response"]
+
+    def _generate(self, prompts: List[str], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs) -> LLMResult:
+        generations = []
+        for prompt in prompts:
+            interaction = self._play(prompt, stop=stop, **kwargs)
+            generations.append([Generation(text=interaction["response"],
+                                           generation_info=interaction["info"] or None)])
+        return LLMResult(generations=generations)
+
+    def summary(self) -> str:
+        return (f"{self.mode} mode: {self.stats['replayed']} replayed, "
+                f"{self.stats['recorded']} recorded, {len(self.cassette)} on cassette")
@@ -0,0 +1,236 @@
+"""
+Session 12 - Shared: Pooled Ollama Client Factory
+One connection pool and one in-flight limit per Ollama server
+
+Features:
+1. HTTP keep-alive connection pool shared by every LLM in the process
+2. Global in-flight limit (semaphore) matched to OLLAMA_NUM_PARALLEL,
+   so extra requests wait here instead of queueing inside the server
+3. Per-request timeouts
+4. Pool statistics: requests, errors, waits, connections opened; the
+   slot wait of each call is also available to tracing (measure_pool_wait)
+5. A LangChain LLM, so it drops in wherever Ollama(...) was used,
+   ReAct agents included
+
+Environment:
+    OLLAMA_BASE_URL      server URL (default http://localhost:11434)
+    OLLAMA_NUM_PARALLEL  in-flight limit (default 4, Ollama's own default)
+
+Usage:
+    llm = create_llm(model="llama3.2", temperature=0.7)
+    llm.invoke("Hello")
+    print(pool_stats())
+"""
+
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from langchain_core.language_models.llms import LLM
+from langchain_core.outputs import Generation, LLMResult
+
+DEFAULT_BASE_URL = "http://localhost:11434"
+
+
+def default_base_url() -> str:
+    return os.environ.get("OLLAMA_BASE_URL", DEFAULT_BASE_URL).rstrip("/")
+
+
+def default_max_in_flight() -> int:
+    return int(os.environ.get("OLLAMA_NUM_PARALLEL", "4"))
+
+
+_pool_waits = contextvars.ContextVar("ollama_pool_waits", default=None)
+
+
+@contextmanager
+def measure_pool_wait():
+    """
+    Collect the in-flight slot waits of pool requests made in this context:
+    with measure_pool_wait() as waits: ...; sum(waits) seconds were queued
+    """
+    waits = []
+    token = _pool_waits.set(waits)
+    try:
+        yield waits
+    finally:
+        _pool_waits.reset(token)
+
+
+class OllamaPool:
+    """
+    Keep-alive session to one Ollama server. At most max_in_flight
+    requests are outstanding; callers beyond that block on the semaphore.
+    """
+
+    def __init__(self, base_url: str = None, max_in_flight: int = None,
+                 connect_timeout: float = 5.0, timeout: float = 300.0):
+        self.base_url = (base_url or default_base_url()).rstrip("/")
+        self.max_in_flight = max_in_flight or default_max_in_flight()
+        self.connect_timeout = connect_timeout
+        self.timeout = timeout
+
+        self._adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_in_flight,
+                                    pool_block=True, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.stats = {"requests": 0, "errors": 0, "timeouts": 0, "peak_in_flight": 0,
+                      "wait_s": 0.0, "request_s": 0.0}
+
+    def post(self, path: str, payload: dict, timeout: float = None) -> dict:
+        """POST JSON to the server and return the decoded response"""
+        start = time.perf_counter()
+        with self._slots:
+            waited = time.perf_counter() - start
+            with self._lock:
+                self._in_flight += 1
+                self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self._in_flight)
+                self.stats["wait_s"] += waited
+            waits = _pool_waits.get()
+            if waits is not None:
+                waits.append(waited)
+            sent = time.perf_counter()
+            try:
+                response = self.session.post(
+                    f"{self.base_url}{path}", json=payload,
+                    timeout=(self.connect_timeout, timeout or self.timeout)
+                )
+                if response.status_code != 200:
+                    try:
+                        detail = response.json().get("error", response.text)
+                    except ValueError:
+                        detail = response.text
+                    raise ValueError(f"Ollama {path} returned {response.status_code}: {detail}")
+                return response.json()
+            except requests.Timeout:
+                self._count("timeouts")
+                raise
+            except (requests.RequestException, ValueError):
+                self._count("errors")
+                raise
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+                    self.stats["requests"] += 1
+                    self.stats["request_s"] += time.perf_counter() - sent
+
+    def _count(self, counter: str):
+        with self._lock:
+            self.stats[counter] += 1
+
+    def connections_opened(self) -> int:
+        """TCP connections opened so far (fewer than requests means keep-alive is working)"""
+        pools = self._adapter.poolmanager.pools
+        return sum(pools[key].num_connections for key in pools.keys())
+
+    def summary(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["in_flight"] = self._in_flight
+        requests_made = stats["requests"]
+        stats["wait_s"] = round(stats["wait_s"], 3)
+        stats["request_s"] = round(stats["request_s"], 3)
+        stats["avg_wait_ms"] = round(stats["wait_s"] / requests_made * 1000, 1) if requests_made else 0.0
+        stats["connections_opened"] = self.connections_opened()
+        stats["max_in_flight"] = self.max_in_flight
+        return stats
+
+    def close(self):
+        self.session.close()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(base_url: str = None, **pool_options) -> OllamaPool:
+    """The process-wide pool for a server, created on first use"""
+    base_url = (base_url or default_base_url()).rstrip("/")
+    with _pools_lock:
+        if base_url not in _pools:
+            _pools[base_url] = OllamaPool(base_url, **pool_options)
+        return _pools[base_url]
+
+
+def pool_stats() -> dict:
+    """Statistics of every pool, keyed by server URL"""
+    with _pools_lock:
+        pools = dict(_pools)
+    return {base_url: pool.summary() for base_url, pool in pools.items()}
+
+
+class PooledOllama(LLM):
+    """
+    Ollama /api/generate over a shared OllamaPool. Field names follow
+    langchain_community's Ollama (model, temperature, stop, format,
+    base_url), so cache keys and option copies behave the same.
+    """
+
+    model: str = "llama3.2"
+    temperature: Optional[float] = None
+    stop: Optional[List[str]] = None
+    format: Optional[str] = None
+    keep_alive: Optional[str] = None
+    timeout: Optional[float] = None
+    options: dict = {}
+    base_url: str = DEFAULT_BASE_URL
+    client: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "ollama-pooled"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model": self.model, "base_url": self.base_url,
+                "temperature": self.temperature, "format": self.format}
+
+    def _payload(self, prompt: str, stop: Optional[List[str]]) -> dict:
+        options = dict(self.options)
+        if self.temperature is not None:
+            options["temperature"] = self.temperature
+        if stop or self.stop:
+            options["stop"] = stop or self.stop
+        payload = {"model": self.model, "prompt": prompt, "stream": False, "options": options}
+        if self.format:
+            payload["format"] = self.format
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        return payload
+
+    def _request(self, prompt: str, stop: Optional[List[str]] = None) -> dict:
+        return self.client.post("/api/generate", self._payload(prompt, stop), timeout=self.timeout)
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> str:
+        return self._request(prompt, stop)["response"]
+
+    def _generate(self, prompts: List[str], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs) -> LLMResult:
+        generations = []
+        for prompt in prompts:
+            data = self._request(prompt, stop)
+            # Everything but the text and the (large) token context: eval counts and durations
+            info = {key: value for key, value in data.items() if key not in ("response", "context")}
+            generations.append([Generation(text=data["response"], generation_info=info)])
+        return LLMResult(generations=generations)
+
+
+def create_llm(model: str = "llama3.2", temperature: float = 0.7, base_url: str = None,
+               stop: list = None, timeout: float = None, keep_alive: str = None, **options) -> PooledOllama:
+    """
+    LLM for the given model on the shared pool of its server. Extra
+    keyword arguments become Ollama options (num_ctx, top_p, ...).
+    """
+    pool = get_pool(base_url)
+    return PooledOllama(model=model, temperature=temperature, stop=stop, timeout=timeout,
+                        keep_alive=keep_alive, options=options, base_url=pool.base_url, client=pool)
@@ -0,0 +1,170 @@
+"""
+Session 12 - Shared: Priority Scheduler for the Shared LLM
+Lets interactive queries preempt queued batch work
+
+Features:
+1. Traffic classes (interactive, batch) sharing a fixed number of LLM slots
+2. Weighted fair queuing between classes that are waiting
+3. Slots reserved for a class (interactive always has at least one)
+4. Per-class queue wait time reporting
+
+Slots should not exceed the Ollama pool's in-flight limit (llm_client,
+OLLAMA_NUM_PARALLEL): calls admitted beyond it wait in the pool's FIFO
+semaphore, where queries queue behind batch calls again.
+
+Usage:
+    scheduler = PriorityScheduler(max_concurrency=get_pool().max_in_flight)
+    batch_llm = ScheduledLLM(llm, scheduler, "batch")
+    with scheduler.slot("interactive"):
+        agent.invoke(...)
+    print(scheduler.report())
+"""
+
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from structured_output import with_llm_options
+
+_queue_wait = contextvars.ContextVar("llm_queue_wait", default=0.0)
+
+
+def current_queue_wait() -> float:
+    """Seconds the LLM call in progress in this context waited for its slot"""
+    return _queue_wait.get()
+
+
+class PriorityScheduler:
+    """
+    Admission control in front of the LLM. A waiting request is admitted
+    when a slot is free; among waiting classes the one with the least
+    service relative to its weight goes first. A class can never take
+    the slots reserved for other classes.
+    """
+
+    def __init__(self, max_concurrency: int = 4, weights: dict = None, reserved: dict = None):
+        self.max_concurrency = max_concurrency
+        self.weights = weights or {"interactive": 4, "batch": 1}
+        self.reserved = reserved if reserved is not None else {"interactive": 1}
+        if sum(self.reserved.values()) >= max_concurrency and len(self.weights) > 1:
+            raise ValueError("Reserved slots must leave room for the other classes")
+
+        self._cond = threading.Condition()
+        self._queues = {name: deque() for name in self.weights}
+        self._in_use = {name: 0 for name in self.weights}
+        self._served = {name: 0 for name in self.weights}
+        self._waits = {name: [] for name in self.weights}
+        self._total_in_use = 0
+
+    def _limit(self, name: str) -> int:
+        """Slots a class may use: everything not reserved for someone else"""
+        return self.max_concurrency - sum(
+            count for other, count in self.reserved.items() if other != name
+        )
+
+    def _virtual_time(self, name: str) -> float:
+        return self._served[name] / self.weights[name]
+
+    def _next_class(self):
+        if self._total_in_use >= self.max_concurrency:
+            return None
+        candidates = [
+            name for name, waiting in self._queues.items()
+            if waiting and self._in_use[name] < self._limit(name)
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda name: (self._virtual_time(name), -self.weights[name]))
+
+    def acquire(self, name: str) -> float:
+        """Block until a slot is granted to this class; returns the wait in seconds"""
+        if name not in self.weights:
+            raise ValueError(f"Unknown priority class: {name}")
+        ticket = object()
+        start = time.perf_counter()
+        with self._cond:
+            if not self._queues[name] and not self._in_use[name]:
+                # A class returning from idle starts at the current virtual time
+                # instead of cashing in the service it did not use
+                active = [self._virtual_time(other) for other in self.weights
+                          if other != name and (self._queues[other] or self._in_use[other])]
+                if active:
+                    self._served[name] = max(self._served[name], min(active) * self.weights[name])
+            self._queues[name].append(ticket)
+
+            while not (self._next_class() == name and self._queues[name][0] is ticket):
+                self._cond.wait()
+
+            self._queues[name].popleft()
+            self._in_use[name] += 1
+            self._total_in_use += 1
+            self._served[name] += 1
+            waited = time.perf_counter() - start
+            self._waits[name].append(waited)
+            self._cond.notify_all()
+        return waited
+
+    def release(self, name: str):
+        with self._cond:
+            self._in_use[name] -= 1
+            self._total_in_use -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, name: str):
+        self.acquire(name)
+        try:
+            yield
+        finally:
+            self.release(name)
+
+    def stats(self) -> dict:
+        """Per-class counts and queue wait times in milliseconds"""
+        with self._cond:
+            report = {}
+            for name, waits in self._waits.items():
+                ordered = sorted(waits)
+                report[name] = {
+                    "waiting": len(self._queues[name]),
+                    "in_use": self._in_use[name],
+                    "served": len(waits),
+                    "avg_wait_ms": round(sum(ordered) / len(ordered) * 1000, 2) if ordered else 0.0,
+                    "p95_wait_ms": round(ordered[max(0, int(len(ordered) * 0.95 + 0.5) - 1)] * 1000, 2) if ordered else 0.0,
+                    "max_wait_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+                }
+            return report
+
+    def report(self) -> str:
+        lines = []
+        for name, stats in self.stats().items():
+            lines.append(
+                f"{name:<12} served {stats['served']:>5}  waiting {stats['waiting']:>3}  "
+                f"wait avg {stats['avg_wait_ms']}ms  p95 {stats['p95_wait_ms']}ms  max {stats['max_wait_ms']}ms"
+            )
+        return "\n".join(lines)
+
+
+class ScheduledLLM:
+    """LLM wrapper whose invoke() waits for a scheduler slot of its class"""
+
+    def __init__(self, llm, scheduler: PriorityScheduler, priority_class: str = "batch"):
+        self.llm = llm
+        self.scheduler = scheduler
+        self.priority_class = priority_class
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+    def bind_options(self, **options):
+        return ScheduledLLM(with_llm_options(self.llm, **options), self.scheduler, self.priority_class)
+
+    def invoke(self, prompt: str, **kwargs) -> str:
+        waited = self.scheduler.acquire(self.priority_class)
+        token = _queue_wait.set(waited)
+        try:
+            return self.llm.invoke(prompt, **kwargs)
+        finally:
+            _queue_wait.reset(token)
+            self.scheduler.release(self.priority_class)
@@ -0,0 +1,140 @@
+"""
+Session 12 - Shared: Single-Flight Coalescing of Identical LLM Calls
+Concurrent identical prompts share one generation instead of queueing N
+
+Features:
+1. Calls keyed like the response cache (model, sampling options, stop, prompt)
+2. The first caller generates; callers arriving while it is in flight
+   wait for it and get the same response (or the same exception)
+3. Nothing is kept once the generation finishes - that is the response
+   cache's job (llm_cache), which this composes with
+4. Counters: generations run and calls coalesced onto them
+5. A real LangChain LLM, so the ReAct agents can use it too
+
+Usage:
+    group = SingleFlight()
+    llm = SingleFlightLLM.wrap(create_llm(model="llama3.2"), group)
+    cached = CachedLLM(llm, disk_cache=SQLiteCache("llm_cache.sqlite"))  # misses coalesce too
+    print(group.summary())
+"""
+
+import threading
+from typing import Any, List, Optional
+
+from langchain_core.language_models.llms import LLM
+from langchain_core.outputs import Generation, LLMResult
+
+from llm_cache import llm_cache_key
+from structured_output import with_llm_options
+
+# Attributes read through to the wrapped LLM (cache keys, base URL lookups)
+_FORWARDED = ("model", "temperature", "format", "stop", "base_url")
+
+
+class _Flight:
+    """One in-flight generation and the callers waiting on it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    In-flight call registry. do(key, fn) runs fn once per key at a time;
+    concurrent callers with the same key block until it returns.
+    """
+
+    def __init__(self):
+        self._flights = {}  # key -> _Flight
+        self._lock = threading.Lock()
+        self.stats = {"flights": 0, "coalesced": 0, "shared_flights": 0, "peak_waiters": 0}
+
+    def do(self, key: str, fn):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                flight.waiters += 1
+                self.stats["coalesced"] += 1
+                self.stats["peak_waiters"] = max(self.stats["peak_waiters"], flight.waiters)
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                self.stats["flights"] += 1
+                if flight.waiters:
+                    self.stats["shared_flights"] += 1
+            flight.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def summary(self) -> str:
+        with self._lock:
+            stats = dict(self.stats)
+        return (f"{stats['coalesced']} calls coalesced onto {stats['shared_flights']} shared generations "
+                f"({stats['flights']} generations run, at most {stats['peak_waiters']} waiting on one)")
+
+
+class SingleFlightLLM(LLM):
+    """
+    Coalesces concurrent identical invoke() calls on the wrapped LLM
+    through a SingleFlight group. Wrappers sharing a group coalesce
+    with each other.
+    """
+
+    llm: Any
+    group: Any
+
+    @classmethod
+    def wrap(cls, llm, group: SingleFlight = None) -> "SingleFlightLLM":
+        return cls(llm=llm, group=group if group is not None else SingleFlight())
+
+    @property
+    def _llm_type(self) -> str:
+        return "single-flight"
+
+    @property
+    def stats(self) -> dict:
+        return self.group.stats
+
+    def __getattr__(self, name):
+        if name in _FORWARDED:
+            return getattr(self.__dict__["llm"], name, None)
+        raise AttributeError(name)
+
+    def bind_options(self, **options):
+        """Same group over a copy of the wrapped LLM with other options (e.g. format="json")"""
+        return SingleFlightLLM(llm=with_llm_options(self.llm, **options), group=self.group)
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> str:
+        key = llm_cache_key(self.llm, prompt, stop)
+        if stop is not None:
+            kwargs["stop"] = stop
+        return self.group.do(key, lambda: self.llm.invoke(prompt, **kwargs))
+
+    def _generate(self, prompts: List[str], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs) -> LLMResult:
+        return LLMResult(generations=[[Generation(text=self._call(prompt, stop=stop, **kwargs))]
+                                      for prompt in prompts])
+
+    def summary(self) -> str:
+        return self.group.summary()
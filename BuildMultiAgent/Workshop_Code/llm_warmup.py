@@ -0,0 +1,94 @@
+"""
+Session 12 - Shared: Model Warm-Up at System Start
+Pays the model-load latency while the menus render, not on the first request
+
+Features:
+1. Preloads the model with a keep_alive duration (an Ollama generate
+   call without a prompt loads the model and returns)
+2. Runs a tiny priming prompt so the first real request is warm
+3. Runs in a background thread; wait() when a caller needs it done
+4. Reports model-load time separately from inference time
+
+Usage:
+    llm = create_llm(model="llama3.2", keep_alive="30m")
+    warmup = ModelWarmUp(llm, keep_alive="30m").start()
+    ...render menus...
+    print(warmup.summary())
+"""
+
+import threading
+import time
+
+
+class ModelWarmUp:
+    """Background preload + priming of one model"""
+
+    def __init__(self, llm, keep_alive: str = "30m", prime_prompt: str = "Reply with OK."):
+        self.llm = llm
+        self.keep_alive = keep_alive
+        self.prime_prompt = prime_prompt
+        self.report = {"status": "pending"}
+        self._done = threading.Event()
+        self._thread = None
+
+    def start(self) -> "ModelWarmUp":
+        self._thread = threading.Thread(target=self._run, name="model-warmup", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        self.report["status"] = "running"
+        start = time.perf_counter()
+        try:
+            client = getattr(self.llm, "client", None)
+            if client is None:
+                # Not a pooled Ollama client: one ordinary call, timed end to end
+                self.llm.invoke(self.prime_prompt)
+                self.report["prime_s"] = round(time.perf_counter() - start, 3)
+            else:
+                model = self.llm.model
+                loaded = client.post("/api/generate", {"model": model, "keep_alive": self.keep_alive})
+                preload_s = time.perf_counter() - start
+                self.report["load_s"] = round((loaded.get("load_duration") or preload_s * 1e9) / 1e9, 3)
+                self.report["preload_s"] = round(preload_s, 3)
+
+                prime_start = time.perf_counter()
+                primed = client.post("/api/generate", {
+                    "model": model, "prompt": self.prime_prompt, "stream": False,
+                    "keep_alive": self.keep_alive, "options": {"num_predict": 1}
+                })
+                self.report["prime_s"] = round(time.perf_counter() - prime_start, 3)
+                # Inference part of the priming call, without any (re)load
+                total = primed.get("total_duration")
+                if total is not None:
+                    self.report["prime_inference_s"] = round((total - (primed.get("load_duration") or 0)) / 1e9, 3)
+            self.report["status"] = "ready"
+        except Exception as e:
+            self.report["status"] = "failed"
+            self.report["error"] = str(e)
+        finally:
+            self.report["total_s"] = round(time.perf_counter() - start, 3)
+            self._done.set()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: float = None) -> dict:
+        self._done.wait(timeout)
+        return self.report
+
+    def summary(self) -> str:
+        report = dict(self.report)
+        if report["status"] in ("pending", "running"):
+            return "warming up..."
+        if report["status"] == "failed":
+            return f"warm-up failed after {report['total_s']}s: {report['error']}"
+        parts = []
+        if "load_s" in report:
+            parts.append(f"model load {report['load_s']}s")
+        if "prime_inference_s" in report:
+            parts.append(f"priming inference {report['prime_inference_s']}s")
+        else:
+            parts.append(f"priming call {report['prime_s']}s")
+        return f"ready ({', '.join(parts)}, kept alive {self.keep_alive})"
@@ -0,0 +1,359 @@
+"""
+Session 12 - Shared: Local Ollama Stand-In for Load Testing
+Speaks enough of the Ollama API to run every pipeline without a GPU
+
+Endpoints:
+    POST /api/generate     streaming (NDJSON) or not, JSON mode, preload
+    POST /api/chat         same, over messages
+    POST /api/embeddings   deterministic vectors
+    GET  /api/tags         the simulated model
+    GET  /stats            requests, queueing, injected errors
+
+Behaviour knobs:
+    --ttft 0.2             seconds to first token
+    --tokens-per-s 40      generation speed per request
+    --num-parallel 4       requests generated at once (like OLLAMA_NUM_PARALLEL)
+    --max-queue 512        waiting requests beyond this get 503
+    --error-rate 0.01      fraction of requests answered with HTTP 500
+    --load-time 2.0        cold-start cost of the first request per model
+    --responses rules.json canned responses: [{"pattern": regex, "response": text}]
+    --cassette run.jsonl   replay responses recorded by llm_cassette
+
+Responses are otherwise rule-generated: JSON prompts get objects shaped
+like the admission agents expect (transcript, essay, eligibility), ReAct
+prompts get a Final Answer, everything else gets filler text.
+
+Usage:
+    python ollama_simulator.py --port 11435 --ttft 0.3 --tokens-per-s 30
+    OLLAMA_BASE_URL=http://127.0.0.1:11435 python workshop1_batch_runner.py apps/ --workers 8
+
+Standard library only.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+from datetime import datetime, timezone
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error", 503: "Service Unavailable"}
+TOKEN_RE = re.compile(r"\S+\s*")
+GPA_RE = re.compile(r"(?<!\w)\"?gpa\"?\s*[:=]?\s*(\d(?:\.\d+)?)", re.IGNORECASE)
+SUBJECTS_RE = re.compile(r"^\s*(?:subjects|courses)\s*[:\-]\s*(.+)$", re.IGNORECASE | re.MULTILINE)
+YEAR_RE = re.compile(r"\b(20\d{2})\b")
+
+# The task each agent prompt states (workshop1_interactive_with_files)
+ELIGIBILITY_TASK_RE = re.compile(r"Evaluate student eligibility", re.IGNORECASE)
+THEMES_TASK_RE = re.compile(r"themes were found across parts", re.IGNORECASE)
+ESSAY_TASK_RE = re.compile(r"Analyze this (?:essay|excerpt)", re.IGNORECASE)
+TRANSCRIPT_TASK_RE = re.compile(r"information from the transcript|\{\s*\"gpa\"", re.IGNORECASE)
+
+
+def count_tokens(text: str) -> int:
+    """Rough Llama-style token count (about four characters per token)"""
+    return max(1, math.ceil(len(text) / 4)) if text else 0
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class OllamaSimulator:
+    """Rule-based Ollama stand-in with configurable latency, parallelism and failures"""
+
+    def __init__(self, model: str = "llama3.2", ttft: float = 0.2, tokens_per_s: float = 40.0,
+                 num_parallel: int = 4, max_queue: int = 512, error_rate: float = 0.0,
+                 load_time: float = 0.0, response_tokens: int = 60, embedding_dim: int = 384,
+                 responses: list = None, cassette_path: str = None, seed: int = None):
+        self.model = model
+        self.ttft = ttft
+        self.tokens_per_s = tokens_per_s
+        self.num_parallel = num_parallel
+        self.max_queue = max_queue
+        self.error_rate = error_rate
+        self.load_time = load_time
+        self.response_tokens = response_tokens
+        self.embedding_dim = embedding_dim
+        self.responses = [(re.compile(rule["pattern"], re.IGNORECASE), rule["response"])
+                          for rule in (responses or [])]
+        self.recorded = {}
+        if cassette_path:
+            with open(cassette_path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        interaction = json.loads(line)
+                        self.recorded.setdefault(interaction["prompt"], interaction["response"])
+        self.random = random.Random(seed)
+        self._slots = None  # created inside the running loop
+        self._loaded = set()
+        self.stats = {"requests": 0, "generated": 0, "errors_injected": 0, "rejected_busy": 0,
+                      "in_flight": 0, "queued": 0, "peak_queued": 0, "tokens_out": 0}
+
+    # ---- response content -------------------------------------------------
+
+    def json_for(self, prompt: str) -> dict:
+        """
+        Object shaped like what the prompt asks for, recognised by the task
+        the prompt states (the embedded data can mention any key)
+        """
+        gpa_match = GPA_RE.search(prompt)
+        gpa = float(gpa_match.group(1)) if gpa_match else 3.5
+        if ELIGIBILITY_TASK_RE.search(prompt):
+            eligible = gpa >= 3.0
+            return {
+                "eligible": eligible,
+                "score": min(100, round(gpa / 4.0 * 100)),
+                "strengths": ["Strong academic record"] if gpa >= 3.5 else ["Solid coursework"],
+                "weaknesses": [] if eligible else ["GPA below the minimum"],
+                "reasoning": f"Simulated evaluation based on GPA {gpa}."
+            }
+        if THEMES_TASK_RE.search(prompt):
+            return {"main_themes": ["Curiosity", "Perseverance", "Leadership"]}
+        if ESSAY_TASK_RE.search(prompt):
+            return {"main_themes": ["Curiosity", "Perseverance", "Leadership"],
+                    "writing_quality": 7, "authenticity": 8}
+        if TRANSCRIPT_TASK_RE.search(prompt):
+            subjects_match = SUBJECTS_RE.search(prompt)
+            subjects = ([re.sub(r"\s*[\(\-:].*$", "", s).strip() for s in subjects_match.group(1).split(",")]
+                        if subjects_match else ["Mathematics", "Physics"])
+            years = YEAR_RE.findall(prompt)
+            return {"gpa": gpa, "subjects": subjects, "graduation_year": int(years[-1]) if years else 2025}
+        return {"status": "ok", "summary": "Simulated response"}
+
+    def text_for(self, prompt: str, fmt: str = None) -> str:
+        for pattern, response in self.responses:
+            if pattern.search(prompt):
+                return response
+        if prompt in self.recorded:
+            return self.recorded[prompt]
+        if fmt == "json" or re.search(r"\bJSON\b", prompt):
+            return json.dumps(self.json_for(prompt))
+        if "Final Answer" in prompt and "Action" in prompt:
+            return "Thought: I now know the final answer\nFinal Answer: This is a simulated answer."
+        words = re.findall(r"[A-Za-z]{4,}", prompt)[-20:] or ["simulated"]
+        filler = " ".join(words[i % len(words)] for i in range(self.response_tokens - 3))
+        return f"Simulated response: {filler}."
+
+    def embedding_for(self, text: str) -> list:
+        """Deterministic unit vector derived from the text"""
+        values, counter = [], 0
+        while len(values) < self.embedding_dim:
+            digest = hashlib.sha256(f"{counter}:{text}".encode("utf-8")).digest()
+            values.extend((byte - 127.5) / 127.5 for byte in digest)
+            counter += 1
+        values = values[:self.embedding_dim]
+        norm = math.sqrt(sum(v * v for v in values)) or 1.0
+        return [round(v / norm, 6) for v in values]
+
+    # ---- HTTP plumbing -----------------------------------------------------
+
+    @staticmethod
+    def _headers(status: int, extra: str, keep_alive: bool) -> bytes:
+        return (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n{extra}"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode("latin-1")
+
+    async def send_json(self, writer, status: int, payload: dict, keep_alive: bool):
+        data = json.dumps(payload).encode("utf-8")
+        writer.write(self._headers(status, f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n",
+                                   keep_alive) + data)
+        await writer.drain()
+
+    async def send_chunk(self, writer, payload: dict):
+        data = (json.dumps(payload) + "\n").encode("utf-8")
+        writer.write(f"{len(data):X}\r\n".encode("latin-1") + data + b"\r\n")
+        await writer.drain()
+
+    # ---- endpoints ---------------------------------------------------------
+
+    async def _load(self, model: str) -> int:
+        """Simulated cold start; returns load_duration in ns"""
+        if model in self._loaded or not self.load_time:
+            self._loaded.add(model)
+            return 0
+        await asyncio.sleep(self.load_time)
+        self._loaded.add(model)
+        return int(self.load_time * 1e9)
+
+    async def generate(self, body: dict, writer, keep_alive: bool, chat: bool = False):
+        model = body.get("model") or self.model
+        if chat:
+            messages = body.get("messages") or []
+            prompt = "\n".join(str(m.get("content", "")) for m in messages)
+        else:
+            prompt = body.get("prompt")
+
+        if self.max_queue and self.stats["queued"] >= self.max_queue:
+            self.stats["rejected_busy"] += 1
+            return await self.send_json(writer, 503, {"error": "server busy, please try again"}, keep_alive)
+
+        self.stats["queued"] += 1
+        self.stats["peak_queued"] = max(self.stats["peak_queued"], self.stats["queued"])
+        started = time.perf_counter()
+        async with self._slots:
+            self.stats["queued"] -= 1
+            self.stats["in_flight"] += 1
+            try:
+                load_ns = await self._load(model)
+                if self.random.random() < self.error_rate:
+                    self.stats["errors_injected"] += 1
+                    return await self.send_json(writer, 500, {"error": "injected failure"}, keep_alive)
+
+                if not prompt and not chat:
+                    # Preload request: load the model and return
+                    return await self.send_json(writer, 200, {
+                        "model": model, "created_at": now_iso(), "response": "", "done": True,
+                        "done_reason": "load", "load_duration": load_ns
+                    }, keep_alive)
+
+                text = self.text_for(prompt, body.get("format"))
+                tokens = TOKEN_RE.findall(text) or [text]
+                prompt_eval_ns = int(self.ttft * 1e9)
+                stream = body.get("stream", True)
+                await asyncio.sleep(self.ttft)
+
+                def piece(content: str, done: bool) -> dict:
+                    if chat:
+                        return {"model": model, "created_at": now_iso(),
+                                "message": {"role": "assistant", "content": content}, "done": done}
+                    return {"model": model, "created_at": now_iso(), "response": content, "done": done}
+
+                eval_start = time.perf_counter()
+                if stream:
+                    writer.write(self._headers(200, "Content-Type: application/x-ndjson\r\n"
+                                                    "Transfer-Encoding: chunked\r\n", keep_alive))
+                    for token in tokens:
+                        await asyncio.sleep(1.0 / self.tokens_per_s)
+                        await self.send_chunk(writer, piece(token, False))
+                else:
+                    await asyncio.sleep(len(tokens) / self.tokens_per_s)
+
+                final = piece("" if stream else text, True)
+                final.update({
+                    "done_reason": "stop",
+                    "total_duration": int((time.perf_counter() - started) * 1e9),
+                    "load_duration": load_ns,
+                    "prompt_eval_count": count_tokens(prompt),
+                    "prompt_eval_duration": prompt_eval_ns,
+                    "eval_count": len(tokens),
+                    "eval_duration": int((time.perf_counter() - eval_start) * 1e9),
+                })
+                self.stats["generated"] += 1
+                self.stats["tokens_out"] += len(tokens)
+                if stream:
+                    await self.send_chunk(writer, final)
+                    writer.write(b"0\r\n\r\n")
+                    await writer.drain()
+                else:
+                    await self.send_json(writer, 200, final, keep_alive)
+            finally:
+                self.stats["in_flight"] -= 1
+
+    async def embeddings(self, body: dict, writer, keep_alive: bool):
+        text = body.get("prompt") or body.get("input") or ""
+        await asyncio.sleep(self.ttft / 2)
+        await self.send_json(writer, 200, {"embedding": self.embedding_for(str(text))}, keep_alive)
+
+    async def dispatch(self, method: str, path: str, body: dict, writer, keep_alive: bool):
+        self.stats["requests"] += 1
+        if method == "GET" and path in ("/", ""):
+            data = b"Ollama is running"
+            writer.write(self._headers(200, f"Content-Type: text/plain\r\nContent-Length: {len(data)}\r\n",
+                                       keep_alive) + data)
+            return await writer.drain()
+        if method == "GET" and path == "/api/tags":
+            return await self.send_json(writer, 200, {"models": [{"name": f"{self.model}:latest",
+                                                                  "model": f"{self.model}:latest"}]}, keep_alive)
+        if method == "GET" and path == "/stats":
+            return await self.send_json(writer, 200, self.stats, keep_alive)
+        if path in ("/api/generate", "/api/chat", "/api/embeddings"):
+            if method != "POST":
+                return await self.send_json(writer, 405, {"error": "Use POST"}, keep_alive)
+            if path == "/api/embeddings":
+                return await self.embeddings(body, writer, keep_alive)
+            return await self.generate(body, writer, keep_alive, chat=path == "/api/chat")
+        return await self.send_json(writer, 404, {"error": f"No route for {path}"}, keep_alive)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """HTTP/1.1 with keep-alive: serve requests until the client closes"""
+        try:
+            while True:
+                request_line = (await reader.readline()).decode("latin-1").strip()
+                if not request_line:
+                    break
+                method, target, _ = request_line.split(" ", 2)
+                headers = {}
+                while True:
+                    line = (await reader.readline()).decode("latin-1").strip()
+                    if not line:
+                        break
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                raw = await reader.readexactly(length) if length else b""
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    body = json.loads(raw) if raw else {}
+                except json.JSONDecodeError:
+                    await self.send_json(writer, 400, {"error": "Body must be JSON"}, keep_alive)
+                    continue
+                await self.dispatch(method.upper(), target.split("?", 1)[0].rstrip("/"), body, writer, keep_alive)
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 11435):
+        self._slots = asyncio.Semaphore(self.num_parallel)
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"Ollama simulator on http://{host}:{port} "
+              f"(ttft {self.ttft}s, {self.tokens_per_s} tok/s, parallel {self.num_parallel}, "
+              f"errors {self.error_rate:.0%})")
+        print(f"Point the workshops at it: OLLAMA_BASE_URL=http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ollama-compatible stand-in server for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--model", default="llama3.2")
+    parser.add_argument("--ttft", type=float, default=0.2, help="Seconds to first token")
+    parser.add_argument("--tokens-per-s", type=float, default=40.0, help="Generation speed per request")
+    parser.add_argument("--num-parallel", type=int, default=4, help="Requests generated concurrently")
+    parser.add_argument("--max-queue", type=int, default=512, help="Waiting requests before 503 (0 = unbounded)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 500")
+    parser.add_argument("--load-time", type=float, default=0.0, help="Cold-start seconds per model")
+    parser.add_argument("--response-tokens", type=int, default=60, help="Length of free-text responses")
+    parser.add_argument("--responses", default=None, help='JSON list of {"pattern", "response"} rules')
+    parser.add_argument("--cassette", default=None, help="Serve responses recorded by llm_cassette")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for error injection")
+    args = parser.parse_args()
+
+    responses = None
+    if args.responses:
+        with open(args.responses, "r") as f:
+            responses = json.load(f)
+
+    simulator = OllamaSimulator(
+        model=args.model, ttft=args.ttft, tokens_per_s=args.tokens_per_s,
+        num_parallel=args.num_parallel, max_queue=args.max_queue, error_rate=args.error_rate,
+        load_time=args.load_time, response_tokens=args.response_tokens,
+        responses=responses, cassette_path=args.cassette, seed=args.seed
+    )
+    try:
+        asyncio.run(simulator.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nShutting down Ollama simulator...")
+
+
+if __name__ == "__main__":
+    main()
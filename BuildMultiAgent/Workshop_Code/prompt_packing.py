@@ -0,0 +1,189 @@
+"""
+Session 12 - Shared: Compact Serialization of Structured Prompt Inputs
+Fewer prefill tokens for the same facts
+
+Features:
+1. Minified JSON, or a dense key: value format, instead of indent=2 blobs
+2. Redundant fields stripped: empty values and fields the prompt never uses
+3. Extraction strings tidied: JSON text embedded as data (no escaped
+   quotes), prose collapsed to one line without bullets or markdown
+4. Estimated token counts before and after, per prompt
+5. Opt-in per prompt: prompts not enabled keep json.dumps(indent=2)
+
+Token counts are estimates (word pieces, punctuation and indentation
+runs), so compare them with each other; Ollama's real prompt_eval_count
+for each call is in the run trace.
+
+Usage:
+    packer = PromptPacker({"eligibility": "json", "progress": "kv"})
+    prompt = f"STUDENT DATA:\\n{packer.pack('eligibility', extracted, drop=('chunks',))}"
+    print(packer.summary())
+"""
+
+import json
+import math
+import re
+import threading
+
+from structured_output import repair_json
+
+PACK_STYLES = ("json", "kv")
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]|\s*\n\s*| {2,}")
+_BULLET_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+_EMPHASIS_RE = re.compile(r"\*\*|__|^#+\s*")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough Llama-style token count: one per short word, longer words per
+    six characters, one per punctuation mark, one per newline/indent run.
+    """
+    total = 0
+    for piece in _TOKEN_RE.findall(text or ""):
+        if piece[0].isalnum() or piece[0] == "_":
+            total += max(1, math.ceil(len(piece) / 6))
+        else:
+            total += 1
+    return total
+
+
+def squeeze_text(text: str, max_chars: int = None) -> str:
+    """
+    One-line version of model prose: bullets, markdown emphasis and a
+    'Here are the points:' style lead-in dropped, lines joined with '; '.
+    """
+    lines = [_EMPHASIS_RE.sub("", _BULLET_RE.sub("", line)).strip() for line in text.splitlines()]
+    lines = [line for line in lines if line]
+    if len(lines) > 1 and lines[0].endswith(":"):
+        lines = lines[1:]
+    squeezed = "; ".join(_WHITESPACE_RE.sub(" ", line) for line in lines)
+    if max_chars and len(squeezed) > max_chars:
+        cut = squeezed[:max_chars]
+        squeezed = cut[:cut.rfind(" ")] + "…" if " " in cut else cut + "…"
+    return squeezed
+
+
+def prune(value, drop=(), max_text_chars: int = None):
+    """
+    Copy of value without the named fields (at any depth) or empty values.
+    Strings holding JSON become data; other strings are squeezed.
+    """
+    if isinstance(value, dict):
+        pruned = {}
+        for key, item in value.items():
+            if key in drop:
+                continue
+            item = prune(item, drop, max_text_chars)
+            if item is None or item == "" or item == [] or item == {}:
+                continue
+            pruned[key] = item
+        return pruned
+    if isinstance(value, (list, tuple)):
+        items = [prune(item, drop, max_text_chars) for item in value]
+        return [item for item in items if item is not None and item != "" and item != [] and item != {}]
+    if isinstance(value, str):
+        parsed = repair_json(value) if value.lstrip().startswith(("{", "```")) else None
+        if parsed is not None:
+            return prune(parsed, drop, max_text_chars)
+        return squeeze_text(value, max_chars=max_text_chars)
+    return value
+
+
+def compact_json(value) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _scalar(value) -> str:
+    if isinstance(value, bool) or value is None:
+        return json.dumps(value)
+    return str(value)
+
+
+def dense_kv(value, prefix: str = "") -> str:
+    """
+    key: value lines; nested objects as dotted keys, scalar lists
+    comma-joined, lists of objects one '- k=v; k=v' line per item.
+    """
+    if isinstance(value, dict):
+        lines = []
+        for key, item in value.items():
+            name = f"{prefix}{key}"
+            if isinstance(item, dict):
+                lines.append(dense_kv(item, prefix=f"{name}."))
+            elif isinstance(item, list) and any(isinstance(element, (dict, list)) for element in item):
+                lines.append(f"{name}:\n{dense_kv(item)}")
+            elif isinstance(item, list):
+                lines.append(f"{name}: {', '.join(_scalar(element) for element in item)}")
+            else:
+                lines.append(f"{name}: {_scalar(item)}")
+        return "\n".join(line for line in lines if line)
+    if isinstance(value, list):
+        lines = []
+        for item in value:
+            if isinstance(item, dict):
+                lines.append("- " + "; ".join(
+                    f"{key}={compact_json(element) if isinstance(element, (dict, list)) else _scalar(element)}"
+                    for key, element in item.items()
+                ))
+            else:
+                lines.append(f"- {compact_json(item) if isinstance(item, list) else _scalar(item)}")
+        return "\n".join(lines)
+    return _scalar(value)
+
+
+class PromptPacker:
+    """
+    Serializes structured prompt inputs. prompts maps a prompt name to
+    "json" or "kv"; only those prompts are packed, the rest keep the
+    indent=2 JSON they always had.
+    """
+
+    def __init__(self, prompts: dict = None, max_text_chars: int = None):
+        prompts = dict(prompts or {})
+        unknown = {style for style in prompts.values() if style not in PACK_STYLES}
+        if unknown:
+            raise ValueError(f"Unknown pack style {', '.join(sorted(unknown))}; use one of {', '.join(PACK_STYLES)}")
+        self.prompts = prompts
+        self.max_text_chars = max_text_chars
+        self._lock = threading.Lock()
+        self.stats = {}  # prompt name -> {"packed", "tokens_before", "tokens_after"}
+
+    def enabled(self, prompt: str) -> bool:
+        return prompt in self.prompts
+
+    def pack(self, prompt: str, value, drop=()) -> str:
+        """value serialized for the named prompt (drop: fields it never uses)"""
+        original = json.dumps(value, indent=2)
+        style = self.prompts.get(prompt)
+        if style is None:
+            return original
+
+        pruned = prune(value, drop=set(drop), max_text_chars=self.max_text_chars)
+        packed = compact_json(pruned) if style == "json" else dense_kv(pruned)
+        before, after = estimate_tokens(original), estimate_tokens(packed)
+        with self._lock:
+            stats = self.stats.setdefault(prompt, {"packed": 0, "tokens_before": 0, "tokens_after": 0})
+            stats["packed"] += 1
+            stats["tokens_before"] += before
+            stats["tokens_after"] += after
+        return packed
+
+    def report(self) -> dict:
+        with self._lock:
+            report = {prompt: dict(stats) for prompt, stats in self.stats.items()}
+        for stats in report.values():
+            before = stats["tokens_before"]
+            stats["saved_pct"] = round(100 * (before - stats["tokens_after"]) / before, 1) if before else 0.0
+        return report
+
+    def summary(self) -> str:
+        report = self.report()
+        if not report:
+            return "no packed prompts yet" if self.prompts else "prompt packing disabled"
+        return ", ".join(
+            f"{prompt} ({self.prompts[prompt]}) ~{stats['tokens_before']}→{stats['tokens_after']} tokens "
+            f"over {stats['packed']} inputs (-{stats['saved_pct']}%)"
+            for prompt, stats in report.items()
+        )
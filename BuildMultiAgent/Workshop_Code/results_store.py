@@ -0,0 +1,273 @@
+"""
+Session 12 - Workshop 1: Admission Results Repository
+Keeps every processed application queryable after the run
+
+Features:
+1. One row per applicant: extracted data, parsed eligibility
+   (eligible, score, strengths, weaknesses), decision and notification status
+2. Indexed columns for score, eligibility, program and GPA
+3. Small query API: filters, ordering and limits in SQL, no agent re-runs
+4. Imports batch runner JSONL output
+5. CLI for the common questions
+
+Usage:
+    python results_store.py --db admission_results.sqlite import batch_results.jsonl
+    python results_store.py --db admission_results.sqlite top --limit 50
+    python results_store.py --db admission_results.sqlite query --rejected --gpa-above 3.5
+    python results_store.py --db admission_results.sqlite show sarah.johnson@email.com
+"""
+
+import argparse
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from structured_output import repair_json
+
+SUMMARY_COLUMNS = ("applicant_id", "email", "program", "gpa", "eligible", "score",
+                   "decision", "notification_sent", "processed_at")
+ORDER_COLUMNS = ("score", "gpa", "processed_at", "applicant_id")
+
+
+def _as_dict(value):
+    """Agent output as a dict: dicts pass through, text is parsed leniently"""
+    if isinstance(value, dict):
+        return value
+    return repair_json(value) or {}
+
+
+def _as_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ResultsStore:
+    """
+    Processed applications in SQLite. Summary fields are real columns
+    (indexed for the usual filters); the full agent outputs are kept as
+    JSON for show().
+    """
+
+    def __init__(self, path: str = "admission_results.sqlite"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(
+            """CREATE TABLE IF NOT EXISTS results (
+                   applicant_id TEXT PRIMARY KEY,
+                   email TEXT,
+                   program TEXT,
+                   gpa REAL,
+                   eligible INTEGER,
+                   score REAL,
+                   strengths TEXT,
+                   weaknesses TEXT,
+                   decision TEXT,
+                   notification_sent INTEGER NOT NULL DEFAULT 0,
+                   extracted_data TEXT,
+                   eligibility TEXT,
+                   processed_at TEXT NOT NULL
+               );
+               CREATE INDEX IF NOT EXISTS idx_results_score ON results (score);
+               CREATE INDEX IF NOT EXISTS idx_results_eligible_score ON results (eligible, score);
+               CREATE INDEX IF NOT EXISTS idx_results_eligible_gpa ON results (eligible, gpa);
+               CREATE INDEX IF NOT EXISTS idx_results_program_score ON results (program, score);"""
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _row_for(result: dict, email: str = None, program: str = None) -> tuple:
+        extracted = result.get("extracted_data") or {}
+        transcript = _as_dict(extracted.get("transcript"))
+        eligibility = _as_dict(result.get("eligibility"))
+        eligible = eligibility.get("eligible")
+        return (
+            result["applicant_id"],
+            email or result.get("email"),
+            program or result.get("program"),
+            _as_float(transcript.get("gpa")),
+            None if eligible is None else int(bool(eligible)),
+            _as_float(eligibility.get("score")),
+            json.dumps(eligibility.get("strengths", [])),
+            json.dumps(eligibility.get("weaknesses", [])),
+            result.get("decision"),
+            int(bool(result.get("notification_sent"))),
+            json.dumps(extracted),
+            json.dumps(result.get("eligibility")),
+            datetime.now().isoformat(),
+        )
+
+    def save_result(self, result: dict, email: str = None, program: str = None):
+        """Insert or replace one process_application result"""
+        self.save_many([(result, email, program)])
+
+    def save_many(self, items: list):
+        """Bulk insert [(result, email, program), ...] in one transaction"""
+        rows = [self._row_for(result, email, program) for result, email, program in items]
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO results VALUES ({', '.join('?' * 13)})", rows
+            )
+            self._conn.commit()
+
+    def import_jsonl(self, path: str) -> int:
+        """Load the processed records of a batch runner JSONL file; returns how many"""
+        items = []
+        with open(path, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record.get("status") != "processed" or "result" not in record:
+                    continue
+                result = dict(record["result"], applicant_id=record["applicant_id"])
+                # Older batch files carry the program only inside the result, if at all
+                items.append((result, record.get("email"), record.get("program") or result.get("program")))
+        self.save_many(items)
+        return len(items)
+
+    def query(self, eligible: bool = None, min_score: float = None, max_score: float = None,
+              min_gpa: float = None, max_gpa: float = None, program: str = None,
+              decision: str = None, order_by: str = "score", descending: bool = True,
+              limit: int = 50, gpa_above: float = None, gpa_below: float = None) -> list:
+        """
+        Summary rows matching every given filter, as dicts. min_/max_ bounds
+        are inclusive; gpa_above/gpa_below are strict ("GPA > 3.5").
+        """
+        if order_by not in ORDER_COLUMNS:
+            raise ValueError(f"Cannot order by {order_by}; use one of {', '.join(ORDER_COLUMNS)}")
+        clauses, params = [], []
+        for column, operator, value in (
+            ("eligible", "=", None if eligible is None else int(eligible)),
+            ("score", ">=", min_score), ("score", "<=", max_score),
+            ("gpa", ">=", min_gpa), ("gpa", "<=", max_gpa),
+            ("gpa", ">", gpa_above), ("gpa", "<", gpa_below),
+            ("program", "=", program), ("decision", "=", decision),
+        ):
+            if value is not None:
+                clauses.append(f"{column} {operator} ?")
+                params.append(value)
+
+        sql = f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM results"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def top_eligible(self, limit: int = 50, program: str = None) -> list:
+        return self.query(eligible=True, program=program, limit=limit)
+
+    def get(self, applicant_id: str):
+        """Full stored record for one applicant, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM results WHERE applicant_id = ?", (applicant_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        for column in ("strengths", "weaknesses", "extracted_data", "eligibility"):
+            record[column] = json.loads(record[column]) if record[column] else None
+        return record
+
+    def counts(self) -> dict:
+        """Applicants per decision"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT COALESCE(decision, 'unknown'), COUNT(*) FROM results GROUP BY 1"
+            ).fetchall()
+        return {decision: count for decision, count in rows}
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def print_rows(rows: list):
+    if not rows:
+        print("No matching applicants")
+        return
+    print(f"{'APPLICANT':<32} {'PROGRAM':<8} {'GPA':>5} {'ELIGIBLE':>8} {'SCORE':>6}  DECISION")
+    for row in rows:
+        eligible = {1: "yes", 0: "no"}.get(row["eligible"], "?")
+        gpa = f"{row['gpa']:.2f}" if row["gpa"] is not None else "-"
+        score = f"{row['score']:.0f}" if row["score"] is not None else "-"
+        print(f"{row['applicant_id'][:32]:<32} {(row['program'] or '-'):<8} {gpa:>5} "
+              f"{eligible:>8} {score:>6}  {row['decision'] or '-'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query stored admission results")
+    parser.add_argument("--db", default="admission_results.sqlite", help="Results SQLite file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_cmd = commands.add_parser("import", help="Load a batch runner JSONL file")
+    import_cmd.add_argument("path")
+
+    top_cmd = commands.add_parser("top", help="Top eligible applicants by score")
+    top_cmd.add_argument("--limit", type=int, default=50)
+    top_cmd.add_argument("--program")
+
+    query_cmd = commands.add_parser("query", help="Filter applicants")
+    eligibility = query_cmd.add_mutually_exclusive_group()
+    eligibility.add_argument("--eligible", action="store_true")
+    eligibility.add_argument("--rejected", action="store_true")
+    query_cmd.add_argument("--min-gpa", type=float, help="GPA >= value")
+    query_cmd.add_argument("--max-gpa", type=float, help="GPA <= value")
+    query_cmd.add_argument("--gpa-above", type=float, help="GPA > value")
+    query_cmd.add_argument("--gpa-below", type=float, help="GPA < value")
+    query_cmd.add_argument("--min-score", type=float)
+    query_cmd.add_argument("--max-score", type=float)
+    query_cmd.add_argument("--program")
+    query_cmd.add_argument("--decision", choices=("accept", "waitlist", "reject", "manual_review"))
+    query_cmd.add_argument("--order-by", default="score", choices=ORDER_COLUMNS)
+    query_cmd.add_argument("--ascending", action="store_true")
+    query_cmd.add_argument("--limit", type=int, default=50, help="0 for no limit")
+
+    show_cmd = commands.add_parser("show", help="Full record for one applicant")
+    show_cmd.add_argument("applicant_id")
+
+    commands.add_parser("stats", help="Applicants per decision")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.db)
+    start = time.perf_counter()
+    if args.command == "import":
+        print(f"Imported {store.import_jsonl(args.path)} results into {args.db}")
+    elif args.command == "top":
+        print_rows(store.top_eligible(limit=args.limit, program=args.program))
+    elif args.command == "query":
+        eligible = True if args.eligible else False if args.rejected else None
+        print_rows(store.query(
+            eligible=eligible, min_gpa=args.min_gpa, max_gpa=args.max_gpa,
+            gpa_above=args.gpa_above, gpa_below=args.gpa_below,
+            min_score=args.min_score, max_score=args.max_score, program=args.program,
+            decision=args.decision, order_by=args.order_by, descending=not args.ascending,
+            limit=args.limit
+        ))
+    elif args.command == "show":
+        record = store.get(args.applicant_id)
+        print(json.dumps(record, indent=2) if record else f"No results for {args.applicant_id}")
+    elif args.command == "stats":
+        print(f"{len(store)} applicants")
+        for decision, count in sorted(store.counts().items()):
+            print(f"  {decision:<13} {count}")
+    print(f"\n({(time.perf_counter() - start) * 1000:.1f} ms)")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
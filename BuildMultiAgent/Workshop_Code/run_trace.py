@@ -0,0 +1,150 @@
+"""
+Session 12 - Shared: Per-Run Timing and Token Traces
+Where the time and tokens go inside one application run
+
+Features:
+1. Stage spans: wall time, LLM calls and token totals per pipeline stage
+2. Per-call records: wall time, queue time (priority scheduler plus the
+   Ollama pool's in-flight slot), prompt/completion tokens and tokens/s
+   from Ollama's eval counters
+3. Works across worker threads (context variables)
+4. JSONL export, one line per stage and per call
+
+Usage:
+    llm = TracedLLM(Ollama(model="llama3.2"))
+    trace = RunTrace("applicant-42")
+    with trace.stage("extraction"):
+        llm.invoke(prompt)
+    trace.write_jsonl("traces.jsonl")
+"""
+
+import contextvars
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+from llm_client import measure_pool_wait
+from llm_scheduler import current_queue_wait
+from structured_output import with_llm_options
+
+_current_span = contextvars.ContextVar("run_trace_span", default=None)
+
+
+def current_span():
+    """(trace, span dict) of the stage running in this context, or None"""
+    return _current_span.get()
+
+
+class RunTrace:
+    """Stage spans and LLM call records for one run"""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.started_at = time.time()
+        self.stages = []
+        self.calls = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str):
+        span = {"stage": name, "llm_calls": 0, "queue_s": 0.0,
+                "prompt_tokens": 0, "completion_tokens": 0}
+        token = _current_span.set((self, span))
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span["wall_s"] = round(time.perf_counter() - start, 4)
+            span["queue_s"] = round(span["queue_s"], 4)
+            _current_span.reset(token)
+            with self._lock:
+                self.stages.append(span)
+
+    def record_call(self, span: dict, call: dict):
+        with self._lock:
+            call["stage"] = span["stage"]
+            self.calls.append(call)
+            span["llm_calls"] += 1
+            span["queue_s"] += call["queue_s"]
+            span["prompt_tokens"] += call["prompt_tokens"] or 0
+            span["completion_tokens"] += call["completion_tokens"] or 0
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "run_id": self.run_id,
+                "started_at": self.started_at,
+                "total_s": round(sum(span["wall_s"] for span in self.stages), 4),
+                "stages": [dict(span) for span in self.stages],
+                "calls": [dict(call) for call in self.calls],
+            }
+
+    def write_jsonl(self, path: str):
+        """Append one line per stage and per call"""
+        data = self.to_dict()
+        with open(path, "a") as f:
+            for span in data["stages"]:
+                f.write(json.dumps({"run_id": self.run_id, "kind": "stage", **span}) + "\n")
+            for call in data["calls"]:
+                f.write(json.dumps({"run_id": self.run_id, "kind": "llm_call", **call}) + "\n")
+
+    def summary(self) -> str:
+        lines = []
+        for span in self.to_dict()["stages"]:
+            lines.append(
+                f"{span['stage']:<16} {span['wall_s']:>7.2f}s  {span['llm_calls']} LLM calls  "
+                f"queue {span['queue_s']:.2f}s  tokens {span['prompt_tokens']}→{span['completion_tokens']}"
+                + ("  (checkpoint)" if span.get("checkpoint") else "")
+            )
+        return "\n".join(lines)
+
+
+class TracedLLM:
+    """
+    Wraps the raw Ollama LLM and records every generation into the active
+    RunTrace stage. Goes innermost (below the scheduler and cache), since
+    only the raw LLM's generate() exposes Ollama's eval counters.
+    """
+
+    def __init__(self, llm):
+        self.llm = llm
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+    def bind_options(self, **options):
+        return TracedLLM(with_llm_options(self.llm, **options))
+
+    def _generate(self, prompt: str, stop: list = None, **kwargs):
+        """Response text plus Ollama's generation info (empty if unavailable)"""
+        if not hasattr(self.llm, "generate"):
+            return self.llm.invoke(prompt, stop=stop, **kwargs), {}
+        result = self.llm.generate([prompt], stop=stop, **kwargs)
+        generation = result.generations[0][0]
+        return generation.text, generation.generation_info or {}
+
+    def invoke(self, prompt: str, stop: list = None, **kwargs) -> str:
+        active = current_span()
+        if active is None:
+            return self.llm.invoke(prompt, stop=stop, **kwargs)
+
+        start = time.perf_counter()
+        with measure_pool_wait() as pool_waits:
+            text, info = self._generate(prompt, stop=stop, **kwargs)
+        wall = time.perf_counter() - start
+
+        completion_tokens = info.get("eval_count")
+        eval_seconds = (info.get("eval_duration") or 0) / 1e9 or wall
+        trace, span = active
+        trace.record_call(span, {
+            "model": getattr(self.llm, "model", None),
+            "wall_s": round(wall, 4),
+            "queue_s": round(current_queue_wait() + sum(pool_waits), 4),
+            "load_s": round((info.get("load_duration") or 0) / 1e9, 4),
+            "prompt_tokens": info.get("prompt_eval_count"),
+            "completion_tokens": completion_tokens,
+            "tokens_per_s": round(completion_tokens / eval_seconds, 2) if completion_tokens else None,
+            "prompt_chars": len(prompt),
+        })
+        return text
@@ -0,0 +1,158 @@
+"""
+Session 12 - Workshop 1: Semantic Answer Cache
+Reuses answers for rephrased admissions questions
+
+Features:
+1. Query normalization: cache-only phrase rewrites ("last date to apply"
+   -> "deadline"), then stemming + admissions synonyms from faq_index
+2. Hashed word + character n-gram vectors, or any embedding function
+3. Cosine-similarity lookup with a configurable threshold
+4. Never a hit across different entities (program codes, numbers):
+   "EE vs ME" does not get the cached "CS vs EE" answer
+5. TTL expiry and invalidation whenever the FAQ data changes
+6. Hit-rate metrics
+
+Usage:
+    cache = SemanticCache(version_fn=lambda: faq_index.version)
+    answer = cache.get("last date to apply?")
+    if answer is None:
+        answer = run_agent(...)
+        cache.put("last date to apply?", answer)
+"""
+
+import hashlib
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from faq_index import entities, tokenize
+
+# Phrases that mean one FAQ word. Kept here rather than in faq_index's
+# SYNONYMS: as single words ("last", "date") they would send unrelated
+# questions to the deadline answer, as whole phrases they are unambiguous.
+CACHE_PHRASES = (
+    (re.compile(r"\b(?:last|closing|final|due)\s+(?:date|day)(?:\s+(?:to|for)\s+appl(?:y|ying|ications?))?\b",
+                re.IGNORECASE), "deadline"),
+    (re.compile(r"\bapplications?\s+close\b", re.IGNORECASE), "deadline"),
+    (re.compile(r"\bdeadline\s+(?:to|for)\s+appl(?:y|ying|ications?)\b", re.IGNORECASE), "deadline"),
+)
+
+
+def normalize_phrases(text: str) -> str:
+    """Rewrite whole phrases with the single word the rest of the cache uses"""
+    for pattern, replacement in CACHE_PHRASES:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def _bucket(feature: str, dimensions: int) -> int:
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % dimensions
+
+
+def hashed_ngram_vector(text: str, dimensions: int = 2048, char_weight: float = 0.3) -> dict:
+    """
+    Sparse, L2-normalised vector of hashed features: normalised word tokens
+    (synonyms such as "due" and "deadline" land together) plus character
+    3-grams at a lower weight for spelling variants. Phrases are left to
+    SemanticCache, which rewrites them before embedding.
+    """
+    tokens = tokenize(text)
+    vector = {}
+    for token in tokens:
+        index = _bucket("w:" + token, dimensions)
+        vector[index] = vector.get(index, 0.0) + 1.0
+    joined = " ".join(tokens)
+    for i in range(len(joined) - 2):
+        index = _bucket("c:" + joined[i:i + 3], dimensions)
+        vector[index] = vector.get(index, 0.0) + char_weight
+    norm = math.sqrt(sum(value * value for value in vector.values()))
+    if norm:
+        vector = {index: value / norm for index, value in vector.items()}
+    return vector
+
+
+def cosine(a: dict, b: dict) -> float:
+    """Dot product of two normalised sparse vectors"""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(value * b.get(index, 0.0) for index, value in a.items())
+
+
+class SemanticCache:
+    """
+    Answers keyed by query meaning rather than exact text.
+    version_fn returns the current FAQ version; entries stored under an
+    older version are dropped on sight.
+    """
+
+    def __init__(self, threshold: float = 0.85, ttl_seconds: float = 24 * 3600,
+                 max_entries: int = 2000, embed_fn=hashed_ngram_vector, version_fn=None):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.embed_fn = embed_fn
+        self.version_fn = version_fn or (lambda: 0)
+        self._entries = OrderedDict()  # normalised query -> (vector, answer, created_at, version, entities)
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "invalidated": 0}
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return " ".join(tokenize(normalize_phrases(query)))
+
+    def get(self, query: str):
+        """Closest cached answer above the threshold, or None"""
+        key = self.normalize(query)
+        vector = self.embed_fn(normalize_phrases(query))
+        query_entities = entities(query)
+        version = self.version_fn()
+        now = time.time()
+
+        with self._lock:
+            best_key, best_score = None, 0.0
+            for cached_key, (cached_vector, _, created_at, cached_version, cached_entities) \
+                    in list(self._entries.items()):
+                if cached_version != version or (self.ttl_seconds is not None
+                                                 and now - created_at > self.ttl_seconds):
+                    del self._entries[cached_key]
+                    self.stats["invalidated"] += 1
+                    continue
+                if cached_entities != query_entities:
+                    continue  # Same wording, different program or number: a different question
+                score = 1.0 if cached_key == key else cosine(vector, cached_vector)
+                if score > best_score:
+                    best_key, best_score = cached_key, score
+
+            if best_key is not None and best_score >= self.threshold:
+                self._entries.move_to_end(best_key)
+                self.stats["hits"] += 1
+                return self._entries[best_key][1]
+
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, query: str, answer: str):
+        key = self.normalize(query)
+        with self._lock:
+            self._entries[key] = (self.embed_fn(normalize_phrases(query)), answer, time.time(), self.version_fn(), entities(query))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def hit_rate(self) -> float:
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.stats['hits']} hits, {self.stats['misses']} misses "
+                f"({self.hit_rate():.0%} hit rate), {len(self)} cached answers")
@@ -0,0 +1,199 @@
+"""
+Session 12 - Shared: Structured JSON Output for LLM Calls
+Asks the model for JSON natively and returns validated Python objects
+
+Features:
+1. Native JSON mode (Ollama format="json"), or a JSON schema as the format
+   on Ollama servers that support schema-constrained output
+2. Minimal schema validation (type, required, properties, items, min/max)
+3. Cheap local repair of common slips (code fences, prose around the JSON,
+   trailing commas, Python literals, numbers sent as strings)
+4. A bounded retry that shows the model its own error
+
+Usage:
+    json_llm = JSONOutput(llm)
+    data = json_llm.invoke_json(prompt, schema=TRANSCRIPT_SCHEMA)
+"""
+
+import json
+import re
+import threading
+
+
+class StructuredOutputError(ValueError):
+    """The model did not produce valid JSON for the schema, even after retries"""
+
+    def __init__(self, message: str, raw: str = ""):
+        super().__init__(message)
+        self.raw = raw
+
+
+def with_llm_options(llm, **options):
+    """
+    Copy of llm with different generation options, e.g. format="json".
+    Wrappers implement bind_options; LangChain LLMs are pydantic models
+    and are rebuilt from their field values. (copy(update=...) would drop
+    the exclude=True fields callbacks, tags and metadata, and the copy
+    then fails on its first call.) Anything else is returned unchanged.
+    """
+    if hasattr(llm, "bind_options"):
+        return llm.bind_options(**options)
+    fields = getattr(type(llm), "__fields__", None)
+    if fields and all(name in fields for name in options):
+        return type(llm)(**{**{name: getattr(llm, name) for name in fields}, **options})
+    return llm
+
+
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_PY_LITERAL_RE = re.compile(r"\b(True|False|None)\b")
+
+
+def repair_json(text: str):
+    """
+    Parse a JSON object out of a model response, fixing the usual slips.
+    Returns a dict, or None if nothing parseable is found.
+    """
+    if not isinstance(text, str):
+        return None
+    candidate = _FENCE_RE.sub("", text.strip())
+
+    json_start = candidate.find('{')
+    json_end = candidate.rfind('}') + 1
+    if json_start == -1 or json_end <= json_start:
+        return None
+    candidate = candidate[json_start:json_end]
+
+    for attempt in (
+        candidate,
+        _TRAILING_COMMA_RE.sub(r"\1", candidate),
+        _PY_LITERAL_RE.sub(lambda m: _PY_LITERALS[m.group(1)], _TRAILING_COMMA_RE.sub(r"\1", candidate)),
+    ):
+        try:
+            parsed = json.loads(attempt)
+        except json.JSONDecodeError:
+            continue
+        return parsed if isinstance(parsed, dict) else None
+    return None
+
+
+_JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+}
+
+
+def _coerce(value, expected: str):
+    """Targeted repair for scalar type slips such as "8" for 8"""
+    if expected in ("number", "integer") and isinstance(value, str):
+        try:
+            number = float(value.strip().rstrip("%").split("/")[0])
+        except ValueError:
+            return value
+        return int(number) if expected == "integer" or number.is_integer() else number
+    if expected == "boolean" and isinstance(value, str) and value.lower() in ("true", "false", "yes", "no"):
+        return value.lower() in ("true", "yes")
+    if expected == "array" and isinstance(value, str):
+        return [value] if value else []
+    return value
+
+
+def validate(value, schema: dict, path: str = "$"):
+    """
+    Validate (and lightly coerce) value against a small JSON-schema subset.
+    Returns (value, errors).
+    """
+    errors = []
+    expected = schema.get("type")
+    if expected:
+        value = _coerce(value, expected)
+        python_type = _JSON_TYPES[expected]
+        if isinstance(value, bool) and expected in ("number", "integer"):
+            errors.append(f"{path}: expected {expected}, got boolean")
+            return value, errors
+        if not isinstance(value, python_type):
+            errors.append(f"{path}: expected {expected}, got {type(value).__name__}")
+            return value, errors
+
+    if isinstance(value, dict):
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append(f"{path}: missing required key '{key}'")
+        for key, subschema in schema.get("properties", {}).items():
+            if key in value:
+                value[key], sub_errors = validate(value[key], subschema, f"{path}.{key}")
+                errors.extend(sub_errors)
+    elif isinstance(value, list) and "items" in schema:
+        for index, item in enumerate(value):
+            value[index], sub_errors = validate(item, schema["items"], f"{path}[{index}]")
+            errors.extend(sub_errors)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        if "minimum" in schema and value < schema["minimum"]:
+            errors.append(f"{path}: {value} is below minimum {schema['minimum']}")
+        if "maximum" in schema and value > schema["maximum"]:
+            errors.append(f"{path}: {value} is above maximum {schema['maximum']}")
+
+    return value, errors
+
+
+class JSONOutput:
+    """
+    JSON-mode view of an LLM. invoke_json returns a validated dict or
+    raises StructuredOutputError (with the last raw response attached).
+    """
+
+    def __init__(self, llm, schema_constrained: bool = False, max_retries: int = 1):
+        self.llm = llm
+        self.schema_constrained = schema_constrained
+        self.max_retries = max_retries
+        self._json_llm = with_llm_options(llm, format="json")
+        self.stats = {"ok": 0, "repaired": 0, "retried": 0, "failed": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, counter: str):
+        with self._lock:
+            self.stats[counter] += 1
+
+    def _llm_for(self, schema: dict):
+        if schema and self.schema_constrained:
+            return with_llm_options(self.llm, format=schema)
+        return self._json_llm
+
+    def invoke_json(self, prompt: str, schema: dict = None) -> dict:
+        llm = self._llm_for(schema)
+        raw = llm.invoke(prompt)
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                parsed = json.loads(raw)
+                repaired = False
+            except (json.JSONDecodeError, TypeError):
+                parsed = repair_json(raw)
+                repaired = True
+
+            if parsed is None or not isinstance(parsed, dict):
+                errors = ["response is not a JSON object"]
+            elif schema:
+                parsed, errors = validate(parsed, schema)
+            else:
+                errors = []
+
+            if not errors:
+                self._count("repaired" if repaired else "ok")
+                return parsed
+
+            if attempt == self.max_retries:
+                break
+            self._count("retried")
+            raw = llm.invoke(
+                f"{prompt}\n\nYour previous response was invalid ({'; '.join(errors[:3])}):\n"
+                f"{str(raw)[:500]}\n\nReturn ONLY the corrected JSON object."
+            )
+
+        self._count("failed")
+        raise StructuredOutputError(f"Invalid JSON from model: {'; '.join(errors[:3])}", raw=raw)
@@ -0,0 +1,46 @@
+"""
+Session 12 - Tests: Communication Manager Decisions
+Only usable eligibility decisions produce an email
+
+Usage:
+    python -m pytest test_communication.py -q
+"""
+
+import pytest
+
+from workshop1_interactive_with_files import CommunicationManagerAgent
+
+
+class RecordingLLM:
+    def __init__(self):
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return "You showed real curiosity."
+
+
+@pytest.mark.parametrize("eligibility", [
+    "The student is probably eligible, I think, score around 80",  # Unparseable raw fallback
+    '{"gpa": 3.9, "subjects": ["Math"]}',                            # JSON, not a decision
+    {"eligible": "maybe", "score": 80},                              # No boolean decision
+])
+def test_unusable_decision_goes_to_manual_review(eligibility):
+    llm = RecordingLLM()
+    notification = CommunicationManagerAgent(llm).notify("a@example.com", eligibility)
+    assert notification["decision"] == "manual_review"
+    assert notification["sent"] is False
+    assert notification["content"] is None
+    assert llm.prompts == []
+
+
+@pytest.mark.parametrize("eligibility, outcome", [
+    ({"eligible": True, "score": 85, "strengths": ["Math"]}, "accept"),
+    ({"eligible": True, "score": 60, "strengths": ["Math"]}, "waitlist"),
+    ('{"eligible": false, "score": 30}', "reject"),
+])
+def test_decision_is_emailed(eligibility, outcome):
+    notification = CommunicationManagerAgent(RecordingLLM()).notify("a@example.com", eligibility)
+    assert notification["decision"] == outcome
+    assert notification["sent"] is True
+    assert "Subject: Your Admission Decision" in notification["content"]
@@ -0,0 +1,40 @@
+"""
+Session 12 - Tests: Long-Essay Map-Reduce
+Local merge of per-chunk essay analyses
+
+Usage:
+    python -m pytest test_essay_analysis.py -q
+"""
+
+from workshop1_interactive_with_files import merge_essay_analyses
+
+
+def analysis(themes, quality=7, authenticity=8):
+    return {"main_themes": themes, "writing_quality": quality, "authenticity": authenticity}
+
+
+def test_themes_ranked_by_chunks_mentioning_them():
+    merged = merge_essay_analyses([
+        (analysis(["Leadership", "Curiosity"]), 100),
+        (analysis(["curiosity", "Family"]), 100),
+        (analysis(["Family", " CURIOSITY "]), 100),
+    ])
+    assert merged["theme_counts"] == {"Curiosity": 3, "Family": 2, "Leadership": 1}
+    assert merged["main_themes"] == ["Curiosity", "Family", "Leadership"]
+
+
+def test_theme_repeated_within_one_chunk_counts_once():
+    merged = merge_essay_analyses([
+        (analysis(["Resilience", "resilience", "Resilience  "]), 100),
+        (analysis(["Teamwork"]), 100),
+        (analysis(["Teamwork"]), 100),
+    ])
+    assert merged["theme_counts"] == {"Teamwork": 2, "Resilience": 1}
+    assert merged["main_themes"][0] == "Teamwork"
+
+
+def test_scores_weighted_by_chunk_length():
+    merged = merge_essay_analyses([(analysis(["A"], 9, 6), 300), (analysis(["B"], 5, 10), 100)])
+    assert merged["writing_quality"] == 8.0
+    assert merged["authenticity"] == 7.0
+    assert merged["chunks"] == 2
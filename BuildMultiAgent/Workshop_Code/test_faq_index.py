@@ -0,0 +1,36 @@
+"""
+Session 12 - Tests: FAQ Inverted Index
+Synonym mapping and search over the sample admissions FAQ
+
+Usage:
+    python -m pytest test_faq_index.py -q
+"""
+
+import os
+
+import pytest
+
+from faq_index import FAQIndex
+
+FAQ_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "workshop1_sample_data", "faq.json")
+
+
+@pytest.fixture(scope="module")
+def index():
+    return FAQIndex.from_file(FAQ_PATH)
+
+
+@pytest.mark.parametrize("query", ["What is the tuition?", "How much is tuition per year?"])
+def test_tuition_does_not_match_the_application_fee(index, query):
+    assert "fee" not in [key for key, _, _ in index.search(query, k=3)]
+
+
+@pytest.mark.parametrize("query, key", [
+    ("How much does it cost to apply?", "fee"),
+    ("What is the application price?", "fee"),
+    ("When is the deadline?", "deadline"),
+    ("Is there a dorm?", "housing"),
+])
+def test_synonyms_find_their_entry(index, query, key):
+    assert index.search(query, k=1)[0][0] == key
+    assert index.topic_match(query, key)
@@ -0,0 +1,112 @@
+"""
+Session 12 - Tests: Simulator Responses for the Real Agent Prompts
+Feeds the prompts the admission agents actually build through the
+simulator and checks each response has the shape that agent validates
+
+Usage:
+    python -m pytest test_ollama_simulator.py -q
+"""
+
+import json
+
+import pytest
+
+import workshop1_interactive_with_files as workshop1
+from ollama_simulator import OllamaSimulator
+from prompt_packing import PromptPacker
+from structured_output import validate
+from workshop1_interactive_with_files import (
+    ELIGIBILITY_SCHEMA, ESSAY_SCHEMA, ESSAY_THEMES_SCHEMA, TRANSCRIPT_SCHEMA,
+    CommunicationManagerAgent, DocumentProcessorAgent, EligibilityEvaluatorAgent
+)
+
+TRANSCRIPT = """Student: Jane Doe
+GPA: 3.9
+Courses: Calculus, Physics, English
+Graduation: 2025"""
+
+ESSAY = ("I have always loved taking things apart to see how they work. "
+         "Building a radio with my grandfather taught me patience and curiosity. ")
+
+
+class SimulatedLLM:
+    """Answers like the simulator server would, and records every call"""
+
+    def __init__(self, simulator: OllamaSimulator, fmt: str = None, calls: list = None):
+        self.simulator = simulator
+        self.format = fmt
+        self.calls = calls if calls is not None else []
+
+    def bind_options(self, **options):
+        return SimulatedLLM(self.simulator, options.get("format", self.format), self.calls)
+
+    def invoke(self, prompt: str) -> str:
+        response = self.simulator.text_for(prompt, self.format)
+        self.calls.append((prompt, response))
+        return response
+
+
+@pytest.fixture
+def llm():
+    return SimulatedLLM(OllamaSimulator())
+
+
+def assert_shape(value, schema):
+    assert isinstance(value, dict), value
+    _, errors = validate(value, schema)
+    assert errors == []
+
+
+def test_transcript_prompt(llm):
+    agent = DocumentProcessorAgent(llm, parse_transcripts=False)
+    transcript = agent.extract_document("transcript", TRANSCRIPT)
+    assert_shape(transcript, TRANSCRIPT_SCHEMA)
+    assert transcript["gpa"] == 3.9
+    assert transcript["graduation_year"] == 2025
+
+
+def test_essay_prompt(llm):
+    agent = DocumentProcessorAgent(llm)
+    assert_shape(agent.extract_document("essay", ESSAY), ESSAY_SCHEMA)
+
+
+def test_essay_chunk_prompt(llm):
+    agent = DocumentProcessorAgent(llm, essay_chunk_chars=200)
+    assert_shape(agent.extract_document("essay", "\n\n".join([ESSAY] * 4)), ESSAY_SCHEMA)
+    chunk_calls = [response for prompt, response in llm.calls if "Analyze this excerpt" in prompt]
+    assert len(chunk_calls) > 1
+    for response in chunk_calls:
+        assert_shape(json.loads(response), ESSAY_SCHEMA)
+
+
+def test_theme_reduce_prompt(llm, monkeypatch):
+    merge = workshop1.merge_essay_analyses
+
+    def merge_with_extra_themes(partials, max_themes=5):
+        merged = merge(partials, max_themes)
+        merged["theme_counts"].update({"Family": 1, "Engineering": 1, "Patience": 1})
+        return merged
+
+    monkeypatch.setattr(workshop1, "merge_essay_analyses", merge_with_extra_themes)
+    agent = DocumentProcessorAgent(llm, essay_chunk_chars=200, essay_llm_reduce=True)
+    agent.extract_document("essay", "\n\n".join([ESSAY] * 4))
+    reduce_calls = [response for prompt, response in llm.calls if "themes were found" in prompt]
+    assert len(reduce_calls) == 1
+    assert_shape(json.loads(reduce_calls[0]), ESSAY_THEMES_SCHEMA)
+    assert set(json.loads(reduce_calls[0])) == {"main_themes"}
+
+
+@pytest.mark.parametrize("packer", [None, PromptPacker({"eligibility": "json"}),
+                                    PromptPacker({"eligibility": "kv"})])
+@pytest.mark.parametrize("gpa, eligible", [(3.9, True), (2.4, False)])
+def test_eligibility_prompt(llm, packer, gpa, eligible):
+    extracted = {
+        "transcript": {"gpa": gpa, "subjects": ["Calculus", "Physics"], "graduation_year": 2025},
+        "essay": {"main_themes": ["Curiosity"], "writing_quality": 7, "authenticity": 8},
+        "recommendation": "- Hard working\n- Curious\n- Kind"
+    }
+    agent = EligibilityEvaluatorAgent(llm, prescreen=False, packer=packer)
+    decision = agent.evaluate(extracted)
+    assert_shape(decision, ELIGIBILITY_SCHEMA)
+    assert decision["eligible"] is eligible
+    assert CommunicationManagerAgent.parse_decision(decision) is not None
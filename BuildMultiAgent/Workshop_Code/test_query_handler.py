@@ -0,0 +1,47 @@
+"""
+Session 12 - Tests: Query Handler Fast-Path Routing
+Checks which tool the intent router picks without running the model
+
+Usage:
+    python -m pytest test_query_handler.py -q
+"""
+
+import os
+
+import pytest
+from langchain.llms.fake import FakeListLLM
+
+from workshop1_interactive_with_files import QueryHandlerAgent
+
+FAQ_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "workshop1_sample_data", "faq.json")
+
+
+@pytest.fixture(scope="module", params=[None, FAQ_PATH], ids=["builtin", "faq_file"])
+def handler(request):
+    return QueryHandlerAgent(FakeListLLM(responses=["unused"]), faq_path=request.param, semantic_cache=False)
+
+
+@pytest.mark.parametrize("query, key", [
+    ("What is the application deadline for CS?", "deadline"),
+    ("What GPA do I need for EE?", "gpa"),
+    ("What documents are needed for the ME program?", "documents"),
+])
+def test_faq_question_naming_a_program_gets_the_faq_answer(handler, query, key):
+    tool, tool_input = handler.route(query)
+    assert tool == "FAQ_Search"
+    assert handler.search_faq_top(tool_input, k=1)[0][0] == key
+
+
+@pytest.mark.parametrize("query, program", [
+    ("Tell me about CS", "CS"),
+    ("What is the CS program like?", "CS"),
+    ("Tell me about mechanical engineering", "ME"),
+])
+def test_program_question_gets_program_info(handler, query, program):
+    assert handler.route(query) == ("Program_Info", program)
+
+
+@pytest.mark.parametrize("query", ["Compare CS and EE", "What essay score do I need?", "Tell ME a joke",
+                                   "What is the tuition?", "How much is tuition per year?"])
+def test_ambiguous_query_goes_to_the_agent(handler, query):
+    assert handler.route(query) is None
@@ -0,0 +1,34 @@
+"""
+Session 12 - Tests: Semantic Answer Cache
+Paraphrases hit, different questions and different entities miss
+
+Usage:
+    python -m pytest test_semantic_cache.py -q
+"""
+
+import pytest
+
+from semantic_cache import SemanticCache
+
+
+@pytest.mark.parametrize("cached, asked", [
+    ("when is the deadline", "last date to apply"),
+    ("When is the deadline?", "What is the last date to apply?"),
+    ("What is the deadline to apply?", "When do applications close?"),
+])
+def test_paraphrase_hits(cached, asked):
+    cache = SemanticCache()
+    cache.put(cached, "November 30th")
+    assert cache.get(asked) == "November 30th"
+    assert cache.stats["hits"] == 1
+
+
+@pytest.mark.parametrize("cached, asked", [
+    ("when is the deadline", "what is the application fee"),
+    ("CS vs EE", "EE vs ME"),
+])
+def test_different_question_misses(cached, asked):
+    cache = SemanticCache()
+    cache.put(cached, "cached answer")
+    assert cache.get(asked) is None
+    assert cache.stats["misses"] == 1
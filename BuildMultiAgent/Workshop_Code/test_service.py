@@ -0,0 +1,72 @@
+"""
+Session 12 - Tests: HTTP Service Mode
+Request validation and job expiry, against a stand-in orchestrator
+
+Usage:
+    python -m pytest test_service.py -q
+"""
+
+import asyncio
+import types
+
+import pytest
+
+from workshop1_service import AdmissionService
+
+
+class StubSystem:
+    """Just the parts of AdmissionOrchestrator the service touches"""
+
+    def __init__(self):
+        self.llm = types.SimpleNamespace(base_url="http://ollama")
+        self.scheduler = None
+        self.single_flight = None
+        self.query_handler = types.SimpleNamespace(answer_cache=None)
+
+    def route_request(self, kind, data):
+        return f"{kind} ok"
+
+
+def dispatch(service, method, path, body):
+    return asyncio.run(service.dispatch(method, path, body))
+
+
+@pytest.mark.parametrize("path", ["/query", "/applications"])
+@pytest.mark.parametrize("body", [[], "hi", 3, None])
+def test_non_object_body_is_a_bad_request(path, body):
+    status, payload = dispatch(AdmissionService(StubSystem()), "POST", path, body)
+    assert status == 400
+    assert payload == {"error": "Body must be a JSON object"}
+
+
+@pytest.mark.parametrize("query", [None, "", "   ", ["when"], 42])
+def test_query_must_be_a_non_empty_string(query):
+    status, _ = dispatch(AdmissionService(StubSystem()), "POST", "/query", {"query": query})
+    assert status == 400
+
+
+def test_query_is_answered():
+    assert dispatch(AdmissionService(StubSystem()), "POST", "/query", {"query": "When is the deadline?"}) \
+        == (200, {"answer": "query ok"})
+
+
+def test_finished_jobs_are_pruned():
+    service = AdmissionService(StubSystem(), max_jobs=2)
+    application = {"email": "a@example.com", "documents": {"transcript": "GPA: 3.9"}}
+
+    async def submit_all():
+        job_ids = []
+        for _ in range(4):
+            _, payload = await service.submit_application(application)
+            job_ids.append(payload["job_id"])
+            await asyncio.gather(*service._tasks)
+        return job_ids
+
+    job_ids = asyncio.run(submit_all())
+    assert list(service.jobs) == job_ids[-2:]
+    assert service.application_status(job_ids[0])[0] == 404
+    assert service.application_status(job_ids[-1]) == (200, service.jobs[job_ids[-1]])
+
+    service.job_ttl_s = -1  # everything finished is past its TTL
+    assert service.application_status(job_ids[-1])[0] == 404
+    assert service.jobs == {}
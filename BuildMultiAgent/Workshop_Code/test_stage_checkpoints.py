@@ -0,0 +1,51 @@
+"""
+Session 12 - Tests: Per-Applicant Stage Checkpoints
+Completed stages are reused on resume, failed (raw-text) ones are retried
+
+Usage:
+    python -m pytest test_stage_checkpoints.py -q
+"""
+
+import pytest
+
+from workshop1_interactive_with_files import AdmissionOrchestrator, extraction_completed
+
+
+@pytest.fixture
+def system():
+    return AdmissionOrchestrator(warm_up=False, single_flight=False)
+
+
+def run_counting(system, stage, outputs, inputs=None, completed=None):
+    calls = []
+
+    def func():
+        calls.append(1)
+        return outputs[len(calls) - 1]
+
+    results = [system.run_stage("applicant-1", stage, func, inputs=inputs, completed=completed)
+               for _ in outputs]
+    return results, len(calls)
+
+
+def test_completed_stage_is_reused(system):
+    results, calls = run_counting(system, "eligibility", [{"eligible": True, "score": 80}] * 2, inputs={"gpa": 3.9})
+    assert calls == 1
+    assert results[1] == {"eligible": True, "score": 80}
+
+
+def test_raw_fallback_is_not_checkpointed(system):
+    results, calls = run_counting(system, "eligibility", ["not json", {"eligible": True, "score": 80}],
+                                  inputs={"gpa": 3.9})
+    assert calls == 2
+    assert results == ["not json", {"eligible": True, "score": 80}]
+    assert system.state.load_checkpoint("applicant-1", "eligibility")["output"] == {"eligible": True, "score": 80}
+
+
+def test_extraction_with_a_failed_document_is_retried(system):
+    failed = {"transcript": "GPA maybe 3.9?", "recommendation": "- Kind\n- Curious"}
+    parsed = {"transcript": {"gpa": 3.9, "subjects": ["Math"], "graduation_year": 2025},
+              "recommendation": "- Kind\n- Curious"}
+    _, calls = run_counting(system, "extracted_data", [failed, parsed, parsed], inputs={"transcript": "GPA: 3.9"},
+                            completed=extraction_completed)
+    assert calls == 2
@@ -0,0 +1,367 @@
+"""
+Session 12 - Workshop 1: BATCH College Admission Processing
+Non-interactive entry point for intake season
+
+Features:
+1. Load a collection file (like sample_applications.json) or a directory of them
+2. Process applications concurrently with a bounded in-flight limit
+3. Or pipeline them: extraction, evaluation and notification run as
+   separate stages connected by bounded queues
+4. Checkpoint every stage per applicant (--state) so a crashed batch resumes,
+   and a re-run after a criteria change only redoes the affected stages
+5. Write one JSONL result record per applicant (optionally also to a results database)
+6. Report throughput (applications/min) and p50/p95 latency
+
+Usage:
+    python workshop1_batch_runner.py workshop1_sample_data/sample_applications.json
+    python workshop1_batch_runner.py applications_dir/ --workers 4 --max-in-flight 8 --output results.jsonl
+    python workshop1_batch_runner.py applications_dir/ --pipeline --stage-workers 3,1,1 --queue-size 4
+    python workshop1_batch_runner.py applications_dir/ --state intake_state.sqlite
+    python workshop1_batch_runner.py applications_dir/ --state intake_state.sqlite --criteria '{"min_gpa": 3.3}'
+    python workshop1_batch_runner.py applications_dir/ --results admission_results.sqlite
+    python workshop1_batch_runner.py applications_dir/ --cassette intake.cassette.jsonl --cassette-mode record
+    python workshop1_batch_runner.py applications_dir/ --cassette intake.cassette.jsonl --replay-latency
+    python workshop1_batch_runner.py applications_dir/ --pack-prompts json
+
+Using: Meta's Llama 3.2 8B via Ollama
+"""
+
+import argparse
+import json
+import math
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from prompt_packing import PACK_STYLES, PromptPacker
+from run_trace import RunTrace
+from workshop1_interactive_with_files import AdmissionOrchestrator, Colors
+
+
+def load_application_collection(path: str) -> list:
+    """
+    Load applications from a collection file or a directory of them.
+    Returns a list of (applicant_id, application) pairs.
+    """
+    if os.path.isdir(path):
+        files = sorted(
+            os.path.join(path, name)
+            for name in os.listdir(path)
+            if name.endswith(".json")
+        )
+    else:
+        files = [path]
+
+    applications = []
+    for file_path in files:
+        with open(file_path, 'r') as f:
+            data = json.load(f)
+
+        if "email" in data:
+            # Single application file: use the file name as the id
+            applicant_id = os.path.splitext(os.path.basename(file_path))[0]
+            applications.append((applicant_id, data))
+        else:
+            for applicant_id, application in data.items():
+                applications.append((applicant_id, application))
+
+    return applications
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile (0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize_batch(count: int, failures: int, latencies: list, elapsed: float, output_path: str) -> dict:
+    """Build the throughput/latency summary for a finished batch"""
+    return {
+        "applications": count,
+        "failed": failures,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_min": round(count / elapsed * 60, 2) if elapsed > 0 else 0.0,
+        "p50_latency_s": percentile(latencies, 50),
+        "p95_latency_s": percentile(latencies, 95),
+        "output": output_path
+    }
+
+
+def run_batch(system, applications: list, workers: int = 4, max_in_flight: int = None,
+              output_path: str = "batch_results.jsonl") -> dict:
+    """
+    Run applications through system.process_application concurrently.
+    At most max_in_flight applications are submitted at any time.
+    """
+    max_in_flight = max_in_flight or workers
+    in_flight = threading.BoundedSemaphore(max_in_flight)
+    write_lock = threading.Lock()
+    latencies = []
+    failures = 0
+
+    def process_one(applicant_id, application):
+        start = time.perf_counter()
+        try:
+            result = system.process_application(application, applicant_id=applicant_id)
+            record = {"applicant_id": applicant_id, "email": application.get("email"),
+                      "program": application.get("program"),
+                      "status": result.get("status", "processed"), "result": result}
+        except Exception as e:
+            record = {"applicant_id": applicant_id, "email": application.get("email"),
+                      "program": application.get("program"), "status": "failed", "error": str(e)}
+        finally:
+            in_flight.release()
+        record["latency_s"] = round(time.perf_counter() - start, 3)
+        record["completed_at"] = datetime.now().isoformat()
+        return record
+
+    batch_start = time.perf_counter()
+    with open(output_path, 'w') as out:
+
+        def write_record(future):
+            nonlocal failures
+            record = future.result()
+            with write_lock:
+                latencies.append(record["latency_s"])
+                if record["status"] == "failed":
+                    failures += 1
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for applicant_id, application in applications:
+                in_flight.acquire()  # Backpressure: wait for a free slot
+                future = pool.submit(process_one, applicant_id, application)
+                future.add_done_callback(write_record)
+
+    elapsed = time.perf_counter() - batch_start
+    return summarize_batch(len(applications), failures, latencies, elapsed, output_path)
+
+
+_STOP = object()  # Queue sentinel: no more work for this stage
+
+
+def _run_stage(name: str, func, inbox: queue.Queue, outbox: queue.Queue,
+               workers: int, downstream_workers: int) -> list:
+    """
+    Start one pipeline stage: `workers` threads take jobs from inbox, apply
+    func and put them on outbox. put() blocks while outbox is full, which
+    is what gives the pipeline its backpressure.
+    """
+    remaining = [workers]
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            job = inbox.get()
+            if job is _STOP:
+                break
+            if "error" not in job:
+                start = time.perf_counter()
+                try:
+                    func(job)
+                except Exception as e:
+                    job["error"] = f"{name}: {e}"
+                job["stage_s"][name] = round(time.perf_counter() - start, 3)
+            outbox.put(job)
+
+        # The last worker out tells every downstream worker to stop
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            for _ in range(downstream_workers):
+                outbox.put(_STOP)
+
+    threads = [
+        threading.Thread(target=worker, name=f"{name}-{i}", daemon=True)
+        for i in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def run_pipelined_batch(system, applications: list, extract_workers: int = 2,
+                        evaluate_workers: int = 1, notify_workers: int = 1,
+                        queue_size: int = 4, output_path: str = "batch_results.jsonl") -> dict:
+    """
+    Run applications through a three-stage pipeline:
+    Document Processing → Eligibility Evaluation → Communication
+
+    Each stage has its own worker count and bounded input queue, so applicant
+    N+1 is extracted while applicant N is evaluated and N-1 is emailed.
+    Every job carries its own RunTrace; each stage worker runs inside that
+    trace's span, so records get the same "trace" as process_application.
+    """
+
+    def extract(job):
+        with job["trace"].stage("extracted_data"):
+            job["extracted_data"] = system.extraction_stage(job["applicant_id"], job["application"]["documents"])
+
+    def evaluate(job):
+        with job["trace"].stage("eligibility"):
+            job["eligibility"] = system.eligibility_stage(job["applicant_id"], job["extracted_data"])
+
+    def notify(job):
+        with job["trace"].stage("notification"):
+            job["notification"] = system.notification_stage(
+                job["applicant_id"], job["application"]["email"], job["eligibility"]
+            )
+
+    to_extract = queue.Queue(maxsize=queue_size)
+    to_evaluate = queue.Queue(maxsize=queue_size)
+    to_notify = queue.Queue(maxsize=queue_size)
+    finished = queue.Queue(maxsize=queue_size)
+
+    batch_start = time.perf_counter()
+    _run_stage("extract", extract, to_extract, to_evaluate, extract_workers, evaluate_workers)
+    _run_stage("evaluate", evaluate, to_evaluate, to_notify, evaluate_workers, notify_workers)
+    _run_stage("notify", notify, to_notify, finished, notify_workers, 1)
+
+    def feed():
+        for applicant_id, application in applications:
+            to_extract.put({
+                "applicant_id": applicant_id,
+                "application": application,
+                "trace": RunTrace(applicant_id),
+                "started": time.perf_counter(),
+                "stage_s": {}
+            })
+        for _ in range(extract_workers):
+            to_extract.put(_STOP)
+
+    threading.Thread(target=feed, name="feeder", daemon=True).start()
+
+    latencies = []
+    failures = 0
+    with open(output_path, 'w') as out:
+        while True:
+            job = finished.get()
+            if job is _STOP:
+                break
+            application = job["application"]
+            record = {"applicant_id": job["applicant_id"], "email": application.get("email"),
+                      "program": application.get("program")}
+            if "error" in job:
+                failures += 1
+                record.update({"status": "failed", "error": job["error"]})
+            else:
+                record.update({"status": "processed", "result": {
+                    "status": "processed",
+                    "applicant_id": job["applicant_id"],
+                    "program": application.get("program"),
+                    "extracted_data": job["extracted_data"],
+                    "eligibility": job["eligibility"],
+                    "decision": job["notification"].get("decision"),
+                    "notification_sent": job["notification"].get("sent", True),
+                    "trace": job["trace"].to_dict()
+                }})
+                if system.trace_path:
+                    job["trace"].write_jsonl(system.trace_path)
+                if system.results is not None:
+                    system.results.save_result(record["result"], email=application.get("email"),
+                                               program=application.get("program"))
+            record["latency_s"] = round(time.perf_counter() - job["started"], 3)
+            record["stage_s"] = job["stage_s"]
+            record["completed_at"] = datetime.now().isoformat()
+            latencies.append(record["latency_s"])
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+
+    elapsed = time.perf_counter() - batch_start
+    return summarize_batch(len(applications), failures, latencies, elapsed, output_path)
+
+
+def print_batch_summary(summary: dict):
+    """Print throughput and latency for a finished batch"""
+    print(f"\n{Colors.MAGENTA}{Colors.BOLD}{'=' * 70}{Colors.RESET}")
+    print(f"{Colors.MAGENTA}{Colors.BOLD}{' ' * 22}📊 BATCH SUMMARY{Colors.RESET}")
+    print(f"{Colors.MAGENTA}{Colors.BOLD}{'=' * 70}{Colors.RESET}\n")
+    print(f"  {Colors.CYAN}Applications:{Colors.RESET} {summary['applications']} ({summary['failed']} failed)")
+    print(f"  {Colors.CYAN}Elapsed:{Colors.RESET} {summary['elapsed_s']}s")
+    print(f"  {Colors.CYAN}Throughput:{Colors.RESET} {summary['throughput_per_min']} applications/min")
+    print(f"  {Colors.CYAN}Latency p50:{Colors.RESET} {summary['p50_latency_s']}s")
+    print(f"  {Colors.CYAN}Latency p95:{Colors.RESET} {summary['p95_latency_s']}s")
+    print(f"  {Colors.CYAN}Results:{Colors.RESET} {summary['output']}")
+    print(f"\n{Colors.MAGENTA}{Colors.BOLD}{'=' * 70}{Colors.RESET}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-process admission applications")
+    parser.add_argument("path", help="Collection JSON file or directory of JSON files")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent applications")
+    parser.add_argument("--max-in-flight", type=int, default=None,
+                        help="Max submitted applications at once (default: workers)")
+    parser.add_argument("--output", default="batch_results.jsonl", help="JSONL output file")
+    parser.add_argument("--state", default=":memory:",
+                        help="SQLite checkpoint file; rerun with the same file to resume a crashed batch")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Run extraction, evaluation and notification as pipelined stages")
+    parser.add_argument("--stage-workers", default="2,1,1",
+                        help="Pipeline workers for extract,evaluate,notify (default: 2,1,1)")
+    parser.add_argument("--queue-size", type=int, default=4, help="Pipeline queue size between stages")
+    parser.add_argument("--trace", default=None,
+                        help="Append per-stage and per-LLM-call timings to this JSONL file")
+    parser.add_argument("--criteria", default=None,
+                        help='JSON overrides for the eligibility criteria, e.g. \'{"min_gpa": 3.3}\'. '
+                             'With the same --state file only stages whose inputs changed re-run')
+    parser.add_argument("--document-store", default=None,
+                        help="SQLite file of extractions reused for identical documents across applicants and runs")
+    parser.add_argument("--cassette", default=None,
+                        help="Record/replay LLM calls to/from this JSONL cassette")
+    parser.add_argument("--cassette-mode", default="replay", choices=("record", "replay", "auto"))
+    parser.add_argument("--replay-latency", action="store_true",
+                        help="Replayed calls take as long as they did when recorded (benchmark with --cassette)")
+    parser.add_argument("--results", default=None,
+                        help="Also store results in this SQLite file (query with results_store.py)")
+    parser.add_argument("--no-single-flight", action="store_true",
+                        help="Do not coalesce concurrent identical prompts")
+    parser.add_argument("--pack-prompts", default=None, choices=PACK_STYLES,
+                        help="Serialize the eligibility prompt's inputs compactly in this style")
+    parser.add_argument("--faq", default=None,
+                        help="FAQ entries from this JSON/CSV file, e.g. workshop1_sample_data/faq.json")
+    args = parser.parse_args()
+
+    applications = load_application_collection(args.path)
+    print(f"{Colors.CYAN}Loaded {len(applications)} applications from {args.path}{Colors.RESET}")
+
+    system = AdmissionOrchestrator(state_path=args.state, trace_path=args.trace,
+                                   results_path=args.results, cassette_path=args.cassette,
+                                   cassette_mode=args.cassette_mode, replay_latency=args.replay_latency,
+                                   document_store_path=args.document_store,
+                                   single_flight=not args.no_single_flight, faq_path=args.faq,
+                                   packer=PromptPacker({"eligibility": args.pack_prompts} if args.pack_prompts else {}))
+    if args.criteria:
+        system.eligibility_evaluator.criteria.update(json.loads(args.criteria))
+        print(f"{Colors.CYAN}Eligibility criteria: {system.eligibility_evaluator.criteria}{Colors.RESET}")
+    if args.pipeline:
+        extract_workers, evaluate_workers, notify_workers = (
+            int(n) for n in args.stage_workers.split(",")
+        )
+        summary = run_pipelined_batch(system, applications, extract_workers=extract_workers,
+                                      evaluate_workers=evaluate_workers, notify_workers=notify_workers,
+                                      queue_size=args.queue_size, output_path=args.output)
+    else:
+        summary = run_batch(system, applications, workers=args.workers,
+                            max_in_flight=args.max_in_flight, output_path=args.output)
+    print_batch_summary(summary)
+    print(f"  {Colors.CYAN}Incremental:{Colors.RESET} {system.incremental_summary()}")
+    if system.doc_processor.document_store is not None:
+        print(f"  {Colors.CYAN}Document dedup:{Colors.RESET} "
+              f"{system.doc_processor.stats['dedup_hits']} documents reused")
+    if system.single_flight is not None:
+        print(f"  {Colors.CYAN}Single-flight:{Colors.RESET} {system.single_flight.summary()}")
+    if system.packer.prompts:
+        print(f"  {Colors.CYAN}Prompt packing:{Colors.RESET} {system.packer.summary()}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
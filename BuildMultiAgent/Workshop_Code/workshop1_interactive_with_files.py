@@ -16,10 +16,29 @@ import warnings
 warnings.filterwarnings('ignore', message='.*OpenSSL.*')
 
 from langchain.agents import initialize_agent, AgentType
-from langchain_community.llms import Ollama
 from langchain.tools import Tool
+import contextvars
 import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from string import Template
+
+from application_state import ApplicationStateStore, fingerprint
+from document_store import DocumentStore, document_hash
+from faq_index import FAQIndex
+from llm_cache import CachedLLM, SQLiteCache
+from llm_cassette import CassetteLLM
+from llm_client import create_llm
+from llm_warmup import ModelWarmUp
+from llm_scheduler import PriorityScheduler, ScheduledLLM
+from llm_singleflight import SingleFlight, SingleFlightLLM
+from prompt_packing import PromptPacker
+from results_store import ResultsStore
+from run_trace import RunTrace, TracedLLM, current_span
+from semantic_cache import SemanticCache
+from structured_output import JSONOutput, StructuredOutputError, repair_json, validate
 
 # ANSI color codes for better visibility on white backgrounds
 class Colors:
@@ -46,11 +65,45 @@ class QueryHandlerAgent:
     """
     Agent 1: Handles student queries about admissions
     Tools: FAQ database, program information
+
+    FAQ lookups go through a BM25 inverted index (faq_index.FAQIndex),
+    optionally loaded from a JSON/CSV file of admissions office entries.
+
+    A lightweight intent router answers clear FAQ and program questions
+    straight from the tools; only ambiguous queries run the ReAct agent,
+    and their answers are kept in a semantic cache so rephrasings of the
+    same question are answered without the model.
     """
 
-    def __init__(self, llm):
+    # Program names/codes the router recognises (codes must be upper case).
+    # "ME" also shows up as a shouted pronoun ("Tell ME about..."), so it
+    # only counts next to program context: "ME program", "EE and ME".
+    PROGRAM_PATTERNS = {
+        "CS": re.compile(r"\bCS\b"),
+        "EE": re.compile(r"\bEE\b"),
+        "ME": re.compile(r"\bME\s+(?i:program|degree|major|department)s?\b"
+                         r"|\b(?:CS|EE)\s*(?:,|&|/|(?i:and|or|vs\.?|versus))\s*ME\b"
+                         r"|\bME\s*(?:,|&|/|(?i:and|or|vs\.?|versus))\s*(?:CS|EE)\b"),
+    }
+    PROGRAM_NAME_RE = re.compile(r"(computer science|electrical engineering|mechanical engineering)", re.IGNORECASE)
+    PROGRAM_WORD_RE = re.compile(r"\b(?:program|degree|major|department)s?\b", re.IGNORECASE)
+    PROGRAM_NAMES = {
+        "computer science": "CS",
+        "electrical engineering": "EE",
+        "mechanical engineering": "ME",
+    }
+
+    def __init__(self, llm, faq_path: str = None, fast_path: bool = True,
+                 min_faq_score: float = 2.0, min_faq_margin: float = 1.2,
+                 semantic_cache: bool = True, scheduler: PriorityScheduler = None):
         print(f"{Colors.BLUE}  [Agent Query Handler] Initializing Query Handler...{Colors.RESET}")
         self.llm = llm
+        self.scheduler = scheduler
+        self.fast_path = fast_path
+        self.min_faq_score = min_faq_score
+        self.min_faq_margin = min_faq_margin
+        self.stats = {"fast_path": 0, "react": 0}
+        self._stats_lock = threading.Lock()
 
         # FAQ database (simulate - in production use vector DB)
         self.faq_db = {
@@ -62,6 +115,17 @@ class QueryHandlerAgent:
             "housing": "On-campus housing available, apply separately",
             "scholarships": "Merit scholarships up to $5,000/year available"
         }
+        entries = FAQIndex.read_file(faq_path) if faq_path else self.faq_db
+        self.faq_db = {
+            key: value["answer"] if isinstance(value, dict) else value
+            for key, value in entries.items()
+        }
+        self.faq_index = FAQIndex.from_entries(entries)
+
+        # Cached agent answers are invalidated whenever the FAQ index changes
+        self.answer_cache = None
+        if semantic_cache:
+            self.answer_cache = SemanticCache(version_fn=lambda: self.faq_index.version)
 
         # Create tools for this agent
         self.tools = [
@@ -88,12 +152,29 @@ class QueryHandlerAgent:
 
     def search_faq(self, query: str) -> str:
         """Search FAQ database"""
-        query = query.lower()
-        for key, answer in self.faq_db.items():
-            if key in query:
-                return f"📋 {answer}"
+        hits = self.faq_index.search(query, k=1)
+        if hits:
+            return f"📋 {hits[0][1]}"
         return "ℹ️ For this query, please contact admissions@university.edu"
 
+    def search_faq_top(self, query: str, k: int = 3) -> list:
+        """Top-k FAQ matches as (key, answer, score)"""
+        return self.faq_index.search(query, k=k)
+
+    def update_faq(self, key: str, answer: str, question: str = ""):
+        """Add or change one FAQ entry; only that entry is re-indexed"""
+        self.faq_db[key] = answer
+        self.faq_index.upsert(key, answer, question)
+
+    def reload_faq(self, faq_path: str) -> dict:
+        """Sync the FAQ with a JSON/CSV file, re-indexing only changed entries"""
+        entries = FAQIndex.read_file(faq_path)
+        self.faq_db = {
+            key: value["answer"] if isinstance(value, dict) else value
+            for key, value in entries.items()
+        }
+        return self.faq_index.sync(entries)
+
     def get_program_info(self, program: str) -> str:
         """Get detailed program information"""
         programs = {
@@ -130,9 +211,65 @@ class QueryHandlerAgent:
             """
         return "Program not found"
 
+    def _count(self, counter: str):
+        with self._stats_lock:
+            self.stats[counter] += 1
+
+    def route(self, query: str):
+        """
+        Pick a tool for a clear-cut query without the model.
+        Returns (tool_name, tool_input) or None when the query is ambiguous.
+        """
+        programs = {code for code, pattern in self.PROGRAM_PATTERNS.items() if pattern.search(query)}
+        programs.update(self.PROGRAM_NAMES[name.lower()] for name in self.PROGRAM_NAME_RE.findall(query))
+        # "the CS program" names a program, not the programs FAQ topic
+        faq_query = self.PROGRAM_WORD_RE.sub(" ", query) if programs else query
+
+        hits = self.faq_index.search(faq_query, k=2)
+        if hits and self.faq_index.topic_match(faq_query, hits[0][0]):
+            # A FAQ question about a program ("deadline for CS?") is still a FAQ question
+            if hits[0][2] < self.min_faq_score:
+                return None
+            if len(hits) > 1 and hits[0][2] < self.min_faq_margin * hits[1][2]:
+                return None
+            return "FAQ_Search", faq_query
+
+        # No FAQ topic (answer wording alone, e.g. "essay" in the documents answer, does not count)
+        if len(programs) == 1:
+            return "Program_Info", programs.pop()
+        return None  # Comparisons and everything else are left to the agent
+
     def handle(self, query: str) -> str:
         """Handle a student query"""
-        return self.agent.invoke({"input": query})["output"]
+        if self.fast_path:
+            routed = self.route(query)
+            if routed is not None:
+                tool_name, tool_input = routed
+                self._count("fast_path")
+                if tool_name == "Program_Info":
+                    return self.get_program_info(tool_input).strip()
+                return self.search_faq(tool_input)
+
+        if self.answer_cache is not None:
+            cached = self.answer_cache.get(query)
+            if cached is not None:
+                return cached
+
+        self._count("react")
+        if self.scheduler is not None:
+            # The ReAct loop needs the raw LLM, so the whole run holds one interactive slot
+            with self.scheduler.slot("interactive"):
+                answer = self.agent.invoke({"input": query})["output"]
+        else:
+            answer = self.agent.invoke({"input": query})["output"]
+        if self.answer_cache is not None:
+            self.answer_cache.put(query, answer)
+        return answer
+
+    def summary(self) -> str:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        return f"{stats['fast_path']} answered by the fast path, {stats['react']} by the agent"
 
     def show_available_info(self):
         """Display available information"""
@@ -148,26 +285,237 @@ class QueryHandlerAgent:
         print(f"\n{Colors.BLUE}{'=' * 70}{Colors.RESET}\n")
 
 
+# Schemas for the JSON the extraction and evaluation prompts ask for
+TRANSCRIPT_SCHEMA = {
+    "type": "object",
+    "required": ["gpa", "subjects", "graduation_year"],
+    "properties": {
+        "gpa": {"type": "number", "minimum": 0, "maximum": 4.0},
+        "subjects": {"type": "array", "items": {"type": "string"}},
+        "graduation_year": {"type": "integer"}
+    }
+}
+ESSAY_SCHEMA = {
+    "type": "object",
+    "required": ["main_themes", "writing_quality", "authenticity"],
+    "properties": {
+        "main_themes": {"type": "array", "items": {"type": "string"}},
+        "writing_quality": {"type": "number", "minimum": 1, "maximum": 10},
+        "authenticity": {"type": "number", "minimum": 1, "maximum": 10}
+    }
+}
+ESSAY_THEMES_SCHEMA = {
+    "type": "object",
+    "required": ["main_themes"],
+    "properties": {"main_themes": {"type": "array", "items": {"type": "string"}}}
+}
+ELIGIBILITY_SCHEMA = {
+    "type": "object",
+    "required": ["eligible", "score", "strengths", "weaknesses", "reasoning"],
+    "properties": {
+        "eligible": {"type": "boolean"},
+        "score": {"type": "number", "minimum": 0, "maximum": 100},
+        "strengths": {"type": "array", "items": {"type": "string"}},
+        "weaknesses": {"type": "array", "items": {"type": "string"}}
+    }
+}
+
+
+# Registrar transcript layouts we can read without the model, e.g.
+#   GPA: 3.9 / 4.0        Cumulative GPA 3.45/4.0      GPA: 3.7
+#   Subjects: Mathematics (A+), Physics (A)      Courses: Math - A, Physics - B+
+#   Graduation: June 2025   Graduation Year: 2025   Class of 2025
+TRANSCRIPT_GPA_RE = re.compile(
+    r"^\s*(?:cumulative\s+|overall\s+)?gpa\s*[:\-]?\s*(\d+(?:\.\d+)?)(?:\s*/\s*(\d+(?:\.\d+)?))?",
+    re.IGNORECASE | re.MULTILINE
+)
+TRANSCRIPT_SUBJECTS_RE = re.compile(
+    r"^\s*(?:subjects|courses|coursework)\s*[:\-]\s*(.+)$",
+    re.IGNORECASE | re.MULTILINE
+)
+TRANSCRIPT_SUBJECT_RE = re.compile(
+    r"^\s*([A-Za-z][A-Za-z&/.' ]*?)\s*(?:\(\s*[A-F][+-]?\s*\)|[-:]\s*[A-F][+-]?)?\s*$"
+)
+TRANSCRIPT_GRADUATION_RE = re.compile(
+    r"^\s*(?:graduation(?:\s+(?:year|date))?\s*[:\-]?\s*(?:[A-Za-z]+\s+)?|class\s+of\s+)((?:19|20)\d{2})\b",
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+def parse_transcript(doc_content: str):
+    """
+    Deterministically extract GPA, subjects and graduation year from a
+    transcript in one of the known registrar layouts.
+
+    Returns the same object the transcript prompt asks the model for,
+    or None when the document does not match and needs the LLM.
+    """
+    gpa_match = TRANSCRIPT_GPA_RE.search(doc_content)
+    subjects_match = TRANSCRIPT_SUBJECTS_RE.search(doc_content)
+    graduation_match = TRANSCRIPT_GRADUATION_RE.search(doc_content)
+    if not (gpa_match and subjects_match and graduation_match):
+        return None
+
+    gpa = float(gpa_match.group(1))
+    scale = float(gpa_match.group(2)) if gpa_match.group(2) else 4.0
+    if scale <= 0 or gpa > scale:
+        return None
+    if scale != 4.0:
+        gpa = round(gpa * 4.0 / scale, 2)
+
+    subjects = []
+    for item in subjects_match.group(1).split(","):
+        subject_match = TRANSCRIPT_SUBJECT_RE.match(item)
+        if not subject_match:
+            return None
+        subjects.append(subject_match.group(1).strip())
+    if not subjects:
+        return None
+
+    return {
+        "gpa": gpa,
+        "subjects": subjects,
+        "graduation_year": int(graduation_match.group(1))
+    }
+
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _split_long_paragraph(paragraph: str, max_chars: int) -> list:
+    """Pieces of at most max_chars: whole sentences where possible, words otherwise"""
+    sentences = []
+    for sentence in _SENTENCE_END_RE.split(paragraph):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars + 1)
+            cut = cut if cut > 0 else max_chars
+            sentences.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            sentences.append(sentence)
+    pieces, current = [], ""
+    for sentence in sentences:
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_essay(essay: str, max_chars: int = 1500) -> list:
+    """
+    Split an essay on blank lines and pack consecutive paragraphs into
+    chunks of at most max_chars. A paragraph longer than that (or an essay
+    without paragraph breaks) is split at sentence ends, and a run-on
+    sentence at word boundaries. A short essay comes back as a single chunk.
+    """
+    paragraphs = []
+    for paragraph in re.split(r"\n\s*\n", essay):
+        paragraph = paragraph.strip()
+        if len(paragraph) > max_chars:
+            paragraphs.extend(_split_long_paragraph(paragraph, max_chars))
+        elif paragraph:
+            paragraphs.append(paragraph)
+    chunks, current = [], ""
+    for paragraph in paragraphs:
+        if current and len(current) + len(paragraph) + 2 > max_chars:
+            chunks.append(current)
+            current = paragraph
+        else:
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def merge_essay_analyses(partials: list, max_themes: int = 5) -> dict:
+    """
+    Reduce per-chunk analyses [(analysis, chunk_length), ...] locally:
+    themes ranked by how many chunks mention them, scores averaged
+    weighted by chunk length. Same shape as a single-prompt analysis.
+    """
+    theme_counts, display, order = {}, {}, []
+    quality_sum = authenticity_sum = total_length = 0
+    for analysis, length in partials:
+        seen = set()  # A chunk mentions a theme once, however often it lists it
+        for theme in analysis.get("main_themes", []):
+            key = " ".join(str(theme).lower().split())
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            if key not in theme_counts:
+                theme_counts[key] = 0
+                display[key] = str(theme).strip()
+                order.append(key)
+            theme_counts[key] += 1
+        quality_sum += analysis["writing_quality"] * length
+        authenticity_sum += analysis["authenticity"] * length
+        total_length += length
+
+    ranked = sorted(order, key=lambda key: (-theme_counts[key], order.index(key)))
+    return {
+        "main_themes": [display[key] for key in ranked[:max_themes]],
+        "writing_quality": round(quality_sum / total_length, 1),
+        "authenticity": round(authenticity_sum / total_length, 1),
+        "theme_counts": {display[key]: theme_counts[key] for key in ranked},
+        "chunks": len(partials)
+    }
+
+
 class DocumentProcessorAgent:
     """
     Agent 2: Processes and extracts information from documents
     Uses Llama 3.2 for intelligent extraction
-    """
 
-    def __init__(self, llm):
-        print(f"{Colors.BLUE}  [Agent Document Processor] Initializing Document Processor...{Colors.RESET}")
-        self.llm = llm
-        print(f"{Colors.CYAN}     ✓ Document Processor ready{Colors.RESET}")
+    The transcript, recommendation and essay prompts are independent, so
+    with max_workers > 1 they are sent to the model concurrently and
+    stage 1 costs roughly the slowest single document.
 
-    def extract(self, documents: dict) -> dict:
-        """Extract structured information from documents"""
-        extracted = {}
+    Transcripts in a known registrar layout are parsed locally first
+    (parse_transcript); only unrecognised ones are sent to the model.
+    Transcript and essay analyses come back as validated dicts via the
+    model's JSON mode; the raw text is kept only if that fails.
 
-        for doc_type, doc_content in documents.items():
-            print(f"{Colors.YELLOW}     → Processing {doc_type}...{Colors.RESET}")
+    Essays longer than essay_chunk_chars are analysed map-reduce style:
+    paragraph chunks go to the model in parallel and the partial results
+    are merged locally (merge_essay_analyses), optionally followed by one
+    short LLM call that consolidates the theme list.
+
+    With a document_store, every document is hashed after normalisation
+    and an identical document (a resubmission, a letter shared by several
+    applicants) reuses the stored extraction instead of reaching the model.
+    """
 
-            if doc_type == "transcript":
-                prompt = f"""Extract this information from the transcript:
+    def __init__(self, llm, max_workers: int = 3, parse_transcripts: bool = True,
+                 essay_chunk_chars: int = 1500, essay_workers: int = 4, essay_llm_reduce: bool = False,
+                 document_store: DocumentStore = None):
+        print(f"{Colors.BLUE}  [Agent Document Processor] Initializing Document Processor...{Colors.RESET}")
+        self.llm = llm
+        self.json_llm = JSONOutput(llm)
+        self.max_workers = max_workers
+        self.parse_transcripts = parse_transcripts
+        self.essay_chunk_chars = essay_chunk_chars
+        self.essay_workers = essay_workers
+        self.essay_llm_reduce = essay_llm_reduce
+        self.document_store = document_store
+        # Settings that change the extraction for the same document text
+        self.signature = json.dumps({
+            "model": getattr(llm, "model", None),
+            "essay_chunk_chars": essay_chunk_chars,
+            "essay_llm_reduce": essay_llm_reduce
+        }, sort_keys=True)
+        self.stats = {"parsed_locally": 0, "llm_calls": 0, "essay_chunks": 0, "dedup_hits": 0}
+        self._stats_lock = threading.Lock()
+        mode = f"concurrent x{max_workers}" if max_workers > 1 else "sequential"
+        print(f"{Colors.CYAN}     ✓ Document Processor ready ({mode}){Colors.RESET}")
+
+    def build_prompt(self, doc_type: str, doc_content: str):
+        """Build the extraction prompt for one document (None if unsupported)"""
+        if doc_type == "transcript":
+            return f"""Extract this information from the transcript:
 - GPA (numeric value)
 - Subjects studied (list)
 - Graduation year
@@ -177,11 +525,8 @@ Transcript:
 
 Return ONLY valid JSON: {{"gpa": X.X, "subjects": [...], "graduation_year": YYYY}}"""
 
-                result = self.llm.invoke(prompt)
-                extracted["transcript"] = result
-
-            elif doc_type == "recommendation":
-                prompt = f"""Summarize this recommendation in 3 bullet points:
+        elif doc_type == "recommendation":
+            return f"""Summarize this recommendation in 3 bullet points:
 
 {doc_content}
 
@@ -190,11 +535,17 @@ Format as:
 - Point 2
 - Point 3"""
 
-                result = self.llm.invoke(prompt)
-                extracted["recommendation"] = result
+        elif doc_type == "essay_chunk":
+            return f"""Analyze this excerpt from a longer admissions essay and return JSON:
+
+Excerpt:
+{doc_content}
+
+Return: {{"main_themes": ["theme1", "theme2"], "writing_quality": X, "authenticity": X}}
+Use short theme names. Scores are 1-10 for this excerpt only."""
 
-            elif doc_type == "essay":
-                prompt = f"""Analyze this essay and return JSON:
+        elif doc_type == "essay":
+            return f"""Analyze this essay and return JSON:
 
 Essay:
 {doc_content}
@@ -202,39 +553,288 @@ Essay:
 Return: {{"main_themes": ["theme1", "theme2"], "writing_quality": X, "authenticity": X}}
 Scores are 1-10."""
 
-                result = self.llm.invoke(prompt)
-                extracted["essay"] = result
+        return None
+
+    def _count(self, counter: str):
+        with self._stats_lock:
+            self.stats[counter] += 1
+
+    def extract_document(self, doc_type: str, doc_content: str):
+        """Extract a single document, reusing the stored result for identical content"""
+        if self.document_store is None:
+            return self._extract_document(doc_type, doc_content)
+
+        doc_hash = document_hash(doc_type, doc_content, self.signature)
+        stored = self.document_store.get(doc_hash)
+        if stored is not None:
+            self._count("dedup_hits")
+            print(f"{Colors.CYAN}       ↳ {doc_type}: identical document seen before, reusing extraction{Colors.RESET}")
+            return stored
+
+        output = self._extract_document(doc_type, doc_content)
+        # Raw-text fallbacks of failed JSON extractions are not worth keeping
+        if output is not None and (doc_type == "recommendation" or isinstance(output, dict)):
+            self.document_store.put(doc_hash, doc_type, output)
+        return output
+
+    def _extract_document(self, doc_type: str, doc_content: str):
+        """Extract a single document, parsing locally when possible"""
+        if doc_type == "transcript" and self.parse_transcripts:
+            parsed = parse_transcript(doc_content)
+            if parsed is not None:
+                self._count("parsed_locally")
+                return parsed
+
+        if doc_type == "essay" and self.essay_chunk_chars:
+            chunks = split_essay(doc_content, self.essay_chunk_chars)
+            if len(chunks) > 1:
+                return self.analyze_essay_chunks(chunks)
+
+        prompt = self.build_prompt(doc_type, doc_content)
+        if prompt is None:
+            return None
+        self._count("llm_calls")
+
+        schema = {"transcript": TRANSCRIPT_SCHEMA, "essay": ESSAY_SCHEMA}.get(doc_type)
+        if schema is None:
+            return self.llm.invoke(prompt)
+        try:
+            return self.json_llm.invoke_json(prompt, schema=schema)
+        except StructuredOutputError as e:
+            return e.raw
 
+    def _analyze_chunk(self, chunk: str):
+        self._count("llm_calls")
+        self._count("essay_chunks")
+        try:
+            return self.json_llm.invoke_json(self.build_prompt("essay_chunk", chunk), schema=ESSAY_SCHEMA)
+        except StructuredOutputError:
+            return None
+
+    def analyze_essay_chunks(self, chunks: list):
+        """Map: analyse chunks in parallel. Reduce: merge locally, then optionally consolidate themes"""
+        print(f"{Colors.YELLOW}       ↳ Long essay: {len(chunks)} chunks in parallel{Colors.RESET}")
+        workers = max(1, min(self.essay_workers, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(contextvars.copy_context().run, self._analyze_chunk, chunk)
+                       for chunk in chunks]
+            partials = [(future.result(), len(chunk)) for future, chunk in zip(futures, chunks)]
+
+        partials = [(analysis, length) for analysis, length in partials if analysis is not None]
+        if not partials:
+            return "Essay analysis failed for every chunk"
+        merged = merge_essay_analyses(partials)
+
+        if self.essay_llm_reduce and len(merged["theme_counts"]) > len(merged["main_themes"]):
+            prompt = f"""These themes were found across parts of one admissions essay, with how many parts mention each:
+{json.dumps(merged["theme_counts"])}
+
+Merge duplicates and return the 3-5 most important themes as JSON: {{"main_themes": ["theme1", "theme2"]}}"""
+            self._count("llm_calls")
+            try:
+                reduced = self.json_llm.invoke_json(prompt, schema=ESSAY_THEMES_SCHEMA)
+                merged["main_themes"] = reduced["main_themes"]
+            except StructuredOutputError:
+                pass  # Keep the locally ranked themes
+        return merged
+
+    def extract(self, documents: dict) -> dict:
+        """Extract structured information from documents"""
+        supported = [
+            (doc_type, doc_content)
+            for doc_type, doc_content in documents.items()
+            if doc_type in ("transcript", "recommendation", "essay")
+        ]
+        for doc_type, _ in supported:
+            print(f"{Colors.YELLOW}     → Processing {doc_type}...{Colors.RESET}")
+
+        if self.max_workers > 1 and len(supported) > 1:
+            workers = min(self.max_workers, len(supported))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                # Each task runs in a copy of this context so LLM calls land in the caller's trace
+                futures = [
+                    pool.submit(contextvars.copy_context().run, self.extract_document, doc_type, doc_content)
+                    for doc_type, doc_content in supported
+                ]
+                results = [future.result() for future in futures]
+        else:
+            results = [
+                self.extract_document(doc_type, doc_content)
+                for doc_type, doc_content in supported
+            ]
+
+        # Same shape as the sequential version, in document order
+        extracted = {}
+        for (doc_type, _), result in zip(supported, results):
+            extracted[doc_type] = result
         return extracted
 
 
+def is_structured(output) -> bool:
+    """A stage output that parsed (raw-text fallbacks are strings)"""
+    return isinstance(output, dict)
+
+
+def extraction_completed(extracted: dict) -> bool:
+    """Every JSON document parsed; recommendations are plain text by design"""
+    return all(is_structured(value) for doc_type, value in extracted.items()
+               if doc_type in ("transcript", "essay"))
+
+
+def parse_json_block(value):
+    """Structured stage output as a dict: already-parsed or repaired from raw text"""
+    if isinstance(value, dict):
+        return value
+    return repair_json(value)
+
+
+# Course names that count towards a required subject (matched as substrings, lower case)
+SUBJECT_SYNONYMS = {
+    "math": ("math", "calculus", "algebra", "geometry", "trigonometry", "statistics", "precalc"),
+    "physics": ("physics", "mechanics", "electromagnetism", "physical science"),
+}
+
+
+def compile_eligibility_rules(criteria: dict, gpa_margin: float = 0.1) -> list:
+    """
+    Compile the hard admission criteria into predicates over extracted facts.
+
+    Each rule returns ("pass" | "reject" | "borderline" | "unknown", message).
+    GPAs within gpa_margin below the minimum count as borderline, not reject.
+    Required subjects are matched through SUBJECT_SYNONYMS; a subject that
+    still cannot be matched is borderline, since the transcript may name
+    the course in a way the rules do not know.
+    """
+    rules = []
+
+    min_gpa = criteria.get("min_gpa")
+    if min_gpa is not None:
+        def gpa_rule(facts):
+            gpa = facts.get("gpa")
+            if gpa is None:
+                return "unknown", "GPA not available"
+            if gpa >= min_gpa:
+                return "pass", f"GPA {gpa} meets the {min_gpa} minimum"
+            if gpa >= min_gpa - gpa_margin:
+                return "borderline", f"GPA {gpa} is just below the {min_gpa} minimum"
+            return "reject", f"GPA {gpa} is below the {min_gpa} minimum"
+        rules.append(("min_gpa", gpa_rule))
+
+    required_subjects = [subject.lower() for subject in criteria.get("required_subjects", [])]
+    if required_subjects:
+        def subjects_rule(facts):
+            subjects = facts.get("subjects")
+            if not subjects:
+                return "unknown", "Subjects not available"
+            taken = [str(subject).lower() for subject in subjects]
+            missing = [
+                required for required in required_subjects
+                if not any(name in subject
+                           for name in SUBJECT_SYNONYMS.get(required, (required,))
+                           for subject in taken)
+            ]
+            if missing:
+                return "borderline", f"No recognised course for: {', '.join(m.title() for m in missing)}"
+            return "pass", "All required subjects completed"
+        rules.append(("required_subjects", subjects_rule))
+
+    return rules
+
+
 class EligibilityEvaluatorAgent:
     """
     Agent 3: Evaluates student eligibility based on criteria
     Uses Llama 3.2 for intelligent evaluation
+
+    Hard criteria are checked first by compiled rules. Clear rejects
+    (GPA well below the minimum) are decided locally; passing or
+    borderline applicants, including unrecognised subjects, go to the model.
     """
 
-    def __init__(self, llm):
+    # Essay bookkeeping from chunked analysis that the evaluation prompt never needs
+    REDUNDANT_FIELDS = ("theme_counts", "chunks")
+
+    def __init__(self, llm, prescreen: bool = True, packer: PromptPacker = None):
         print(f"{Colors.BLUE}  [Agent Eligibility Evaluator] Initializing Eligibility Evaluator...{Colors.RESET}")
         self.llm = llm
+        # Serialization of the prompt inputs; opt in with PromptPacker({"eligibility": "json"})
+        self.packer = packer if packer is not None else PromptPacker()
+        self.json_llm = JSONOutput(llm)
         self.criteria = {
             "min_gpa": 3.0,
             "required_subjects": ["Math", "Physics"],
             "min_essay_score": 6
         }
+        self.prescreen_enabled = prescreen
+        self.stats = {"rule_rejects": 0, "llm_calls": 0}
+        self._stats_lock = threading.Lock()
+        self._rules = None
+        self._rules_for = None
         print(f"{Colors.CYAN}     ✓ Evaluator ready with criteria: GPA≥{self.criteria['min_gpa']}{Colors.RESET}")
 
-    def evaluate(self, extracted_data: dict) -> str:
-        """Evaluate eligibility and return decision"""
+    def _count(self, counter: str):
+        with self._stats_lock:
+            self.stats[counter] += 1
+
+    def rules(self) -> list:
+        """Compiled rules, recompiled whenever self.criteria changes"""
+        snapshot = json.dumps(self.criteria, sort_keys=True)
+        if snapshot != self._rules_for:
+            self._rules = compile_eligibility_rules(self.criteria)
+            self._rules_for = snapshot
+        return self._rules
+
+    def prescreen(self, extracted_data: dict):
+        """
+        Run the hard rules against the structured transcript.
+        Returns a decision dict for clear rejects, otherwise None.
+        """
+        transcript = parse_json_block(extracted_data.get("transcript"))
+        if not transcript:
+            return None
+        try:
+            gpa = float(transcript["gpa"]) if transcript.get("gpa") is not None else None
+        except (TypeError, ValueError):
+            gpa = None
+        facts = {"gpa": gpa, "subjects": transcript.get("subjects")}
+
+        outcomes = [(name, *rule(facts)) for name, rule in self.rules()]
+        rejects = [message for _, verdict, message in outcomes if verdict == "reject"]
+        if not rejects:
+            return None
+
+        # Below the bar: scale GPA into the 0-49 band, minus 10 if a required subject is unmatched
+        score = int(min(49, (gpa or 0) / 4.0 * 60))
+        score = max(0, score - 10 * sum(1 for name, verdict, _ in outcomes
+                                        if name == "required_subjects" and verdict == "borderline"))
+        return {
+            "eligible": False,
+            "score": score,
+            "strengths": [message for _, verdict, message in outcomes if verdict == "pass"],
+            "weaknesses": rejects,
+            "reasoning": "The application does not meet the minimum admission requirements. "
+                         + " ".join(f"{message}." for message in rejects),
+            "decided_by": "rules"
+        }
+
+    def evaluate(self, extracted_data: dict):
+        """Evaluate eligibility and return the decision (dict, or raw text if the model's JSON is unusable)"""
         print(f"{Colors.YELLOW}     → Calculating eligibility score...{Colors.RESET}")
 
+        if self.prescreen_enabled:
+            decision = self.prescreen(extracted_data)
+            if decision is not None:
+                self._count("rule_rejects")
+                print(f"{Colors.YELLOW}     → Hard criteria not met, decided by rules{Colors.RESET}")
+                return decision
+
         prompt = f"""Evaluate student eligibility:
 
 CRITERIA:
-{json.dumps(self.criteria, indent=2)}
+{self.packer.pack("eligibility", self.criteria)}
 
 STUDENT DATA:
-{json.dumps(extracted_data, indent=2)}
+{self.packer.pack("eligibility", extracted_data, drop=self.REDUNDANT_FIELDS)}
 
 Determine:
 1. Eligible? (true/false)
@@ -245,40 +845,145 @@ Determine:
 
 Return valid JSON with keys: eligible, score, strengths, weaknesses, reasoning"""
 
-        result = self.llm.invoke(prompt)
-        return result
+        self._count("llm_calls")
+        try:
+            return self.json_llm.invoke_json(prompt, schema=ELIGIBILITY_SCHEMA)
+        except StructuredOutputError as e:
+            return e.raw
+
+
+# Decision emails: the model only writes the $personalization paragraph
+EMAIL_TEMPLATES = {
+    "accept": Template("""Subject: Your Admission Decision - Congratulations!
+
+Dear Applicant,
+
+We are delighted to inform you that you have been admitted to our undergraduate program.
+
+$personalization
+
+Next steps:
+- Accept your offer through the applicant portal by May 1st
+- Submit your enrollment deposit
+- Apply separately for on-campus housing and merit scholarships
+
+If you have any questions, please contact us at admissions@university.edu.
+
+Warm regards,
+Office of Admissions"""),
+    "waitlist": Template("""Subject: Your Admission Decision - Waitlist
+
+Dear Applicant,
+
+Thank you for applying. After careful review, we have placed your application on our waitlist.
+
+$personalization
+
+We will notify you of any change in your status. In the meantime, you are welcome to send us
+updated grades or achievements through the applicant portal.
+
+If you have any questions, please contact us at admissions@university.edu.
+
+Warm regards,
+Office of Admissions"""),
+    "reject": Template("""Subject: Your Admission Decision
+
+Dear Applicant,
+
+Thank you for your interest in our program. After careful review, we are unable to offer you
+admission this year.
+
+$personalization
+
+We encourage you to consider our community college transfer pathway or to reapply next cycle.
+
+If you have any questions, please contact us at admissions@university.edu.
+
+Warm regards,
+Office of Admissions"""),
+}
+
+DEFAULT_PERSONALIZATION = {
+    "accept": "Your application stood out to our committee, and we look forward to welcoming you to campus.",
+    "waitlist": "Your application showed real promise, and the committee appreciated the effort you put into it.",
+    "reject": "This decision does not define your potential, and we hope you keep building on your interests.",
+}
 
 
 class CommunicationManagerAgent:
     """
     Agent 4: Manages all communication with students
     Generates personalized emails using Llama 3.2
+
+    Emails are rendered from accept/waitlist/reject templates; the model
+    only writes a short personalized paragraph from the applicant's
+    strengths. Results that are not a usable decision (unparseable text, or
+    JSON without one) send no email and are flagged for manual review.
     """
 
-    def __init__(self, llm):
+    def __init__(self, llm, accept_score: int = 70):
         print(f"{Colors.BLUE}  [Agent Communication Manager] Initializing Communication Manager...{Colors.RESET}")
         self.llm = llm
+        self.accept_score = accept_score
         print(f"{Colors.CYAN}     ✓ Communication Manager ready{Colors.RESET}")
 
-    def notify(self, email: str, eligibility_result: str) -> dict:
+    @staticmethod
+    def parse_decision(eligibility_result):
+        """
+        The eligibility decision as a dict, or None when the result is not a
+        usable decision (unparseable, or a JSON object without a boolean
+        "eligible" and a numeric score, e.g. another agent's output).
+        """
+        decision = parse_json_block(eligibility_result)
+        if decision is None:
+            return None
+        decision, errors = validate(dict(decision), ELIGIBILITY_SCHEMA)
+        if not isinstance(decision.get("eligible"), bool):
+            return None
+        if any(error.startswith(("$.eligible", "$.score")) for error in errors):
+            return None
+        return decision
+
+    def classify(self, decision: dict) -> str:
+        """accept / waitlist / reject from a parsed eligibility decision"""
+        if not decision.get("eligible"):
+            return "reject"
+        score = decision.get("score", 0)
+        if isinstance(score, (int, float)) and score >= self.accept_score:
+            return "accept"
+        return "waitlist"
+
+    def personalize(self, outcome: str, decision: dict) -> str:
+        """Short personalized paragraph; only this part is generated by the model"""
+        strengths = [str(strength) for strength in decision.get("strengths") or []]
+        if not strengths or decision.get("decided_by") == "rules":
+            return DEFAULT_PERSONALIZATION[outcome]
+
+        prompt = f"""Write 2-3 warm, specific sentences for an admission email ({outcome} decision).
+Mention these strengths of the applicant: {"; ".join(strengths[:3])}
+Do not restate the decision, greet, or sign off. Output only the sentences."""
+        return self.llm.invoke(prompt).strip()
+
+    def notify(self, email: str, eligibility_result) -> dict:
         """Generate and send notification email"""
         print(f"{Colors.YELLOW}     → Preparing notification for {email}...{Colors.RESET}")
 
-        prompt = f"""Write a professional admission email:
-
-DECISION:
-{eligibility_result}
-
-Requirements:
-- Professional but warm tone
-- Clear decision statement
-- If accepted: Congratulate + next steps
-- If not: Encourage + suggest alternatives
-- Include: admissions@university.edu for questions
-
-Write the complete email:"""
+        decision = self.parse_decision(eligibility_result)
+        if decision is None:
+            # Raw text or JSON without a decision: never guess an outcome, let a person look
+            print(f"{Colors.RED}     ⚠️  No usable eligibility decision, flagged for manual review{Colors.RESET}")
+            return {
+                "sent": False,
+                "to": email,
+                "decision": "manual_review",
+                "timestamp": datetime.now().isoformat(),
+                "content": None
+            }
 
-        email_content = self.llm.invoke(prompt)
+        outcome = self.classify(decision)
+        email_content = EMAIL_TEMPLATES[outcome].substitute(
+            personalization=self.personalize(outcome, decision)
+        )
 
         # In production: send via SMTP/SendGrid
         separator = "=" * 60
@@ -291,6 +996,7 @@ Write the complete email:"""
         return {
             "sent": True,
             "to": email,
+            "decision": outcome,
             "timestamp": datetime.now().isoformat(),
             "content": email_content
         }
@@ -302,23 +1008,96 @@ class AdmissionOrchestrator:
     Implements sequential pipeline pattern
     """
 
-    def __init__(self):
+    # Agents that call llm.invoke directly and can share the response cache.
+    # The Query Handler is a LangChain ReAct agent and needs the raw LLM.
+    CACHEABLE_AGENTS = ("doc_processor", "eligibility_evaluator", "comm_manager")
+
+    def __init__(self, extraction_workers: int = 3, cached_agents: tuple = (),
+                 cache_path: str = "llm_cache.sqlite", state_path: str = ":memory:",
+                 scheduler: PriorityScheduler = None, trace_path: str = None,
+                 results_path: str = None, cassette_path: str = None, cassette_mode: str = "replay",
+                 document_store_path: str = None, warm_up: bool = True, keep_alive: str = "30m",
+                 single_flight: bool = True, packer: PromptPacker = None, faq_path: str = None,
+                 replay_latency: bool = False):
         print(f"\n{Colors.CYAN}{Colors.BOLD}🔧 Initializing Admission Management System...{Colors.RESET}")
         dash_line = "-" * 70
         print(f"{Colors.BLUE}{dash_line}{Colors.RESET}")
 
         # Initialize Llama 3.2 (shared across all agents)
         print("\n[Core] Connecting to Meta's Llama 3.2 via Ollama...")
-        self.llm = Ollama(model="llama3.2", temperature=0.7)
+        self.llm = create_llm(model="llama3.2", temperature=0.7, keep_alive=keep_alive)
         print("  ✓ Llama 3.2 8B connected")
 
-        print("\n[Sub-Agents] Initializing specialized agents...")
-        self.query_handler = QueryHandlerAgent(self.llm)
-        self.doc_processor = DocumentProcessorAgent(self.llm)
-        self.eligibility_evaluator = EligibilityEvaluatorAgent(self.llm)
-        self.comm_manager = CommunicationManagerAgent(self.llm)
+        # Load the model now, in the background, instead of on the first request
+        self.warmup = None
+        if warm_up and not (cassette_path and cassette_mode == "replay"):
+            self.warmup = ModelWarmUp(self.llm, keep_alive=keep_alive).start()
+            print(f"  ✓ Model warm-up started in the background (keep_alive {keep_alive})")
+
+        # Optional record/replay of every LLM call (replay needs no running model);
+        # replay_latency sleeps for each call's recorded latency, for benchmarking
+        if cassette_path:
+            self.llm = CassetteLLM.wrap(self.llm, cassette_path, mode=cassette_mode, replay_latency=replay_latency)
+            print(f"  ✓ Cassette {cassette_path} ({cassette_mode} mode, {len(self.llm.cassette)} recorded calls"
+                  + (", recorded latency" if replay_latency else "") + ")")
+
+        # Optional priority scheduling: queries are interactive, the
+        # application pipeline is batch and cannot starve them
+        self.scheduler = scheduler
+        # Pipeline calls are timed and token-counted into each run's trace
+        self.trace_path = trace_path
+        batch_llm = TracedLLM(self.llm)
+        if scheduler is not None:
+            pool = getattr(self.llm, "client", None)
+            if pool is not None and scheduler.max_concurrency > pool.max_in_flight:
+                raise ValueError(f"Scheduler has {scheduler.max_concurrency} slots but the Ollama pool only "
+                                 f"{pool.max_in_flight}; queries would queue behind batch calls in the pool")
+            batch_llm = ScheduledLLM(batch_llm, scheduler, "batch")
+            print(f"  ✓ Priority scheduler: {scheduler.max_concurrency} LLM slots, "
+                  f"reserved {scheduler.reserved}")
+
+        # Concurrent identical prompts (same letter, same FAQ question) share one generation
+        self.single_flight = None
+        query_llm = self.llm
+        if single_flight:
+            self.single_flight = SingleFlight()
+            batch_llm = SingleFlightLLM.wrap(batch_llm, self.single_flight)
+            query_llm = SingleFlightLLM.wrap(self.llm, self.single_flight)
+            print("  ✓ Single-flight: identical in-flight prompts share one generation")
+
+        # Optional response cache, opted into per agent (hits never wait for a slot)
+        unknown = set(cached_agents) - set(self.CACHEABLE_AGENTS)
+        if unknown:
+            raise ValueError(f"Cannot cache agents: {', '.join(sorted(unknown))}")
+        self.cached_llm = None
+        if cached_agents:
+            self.cached_llm = CachedLLM(batch_llm, disk_cache=SQLiteCache(cache_path))
+            print(f"  ✓ Response cache enabled for: {', '.join(cached_agents)}")
+
+        def llm_for(agent_name):
+            return self.cached_llm if agent_name in cached_agents else batch_llm
 
-        self.state = {}  # Shared state across agents
+        print("\n[Sub-Agents] Initializing specialized agents...")
+        # FAQ entries from a JSON/CSV file (faq_path), else the built-in ones
+        self.query_handler = QueryHandlerAgent(query_llm, faq_path=faq_path, scheduler=scheduler)
+        # Optional cross-applicant, cross-run reuse of extractions for identical documents
+        document_store = DocumentStore(document_store_path) if document_store_path else None
+        self.doc_processor = DocumentProcessorAgent(llm_for("doc_processor"), max_workers=extraction_workers,
+                                                    document_store=document_store)
+        # Optional compact serialization of prompt inputs, opted into per prompt
+        self.packer = packer if packer is not None else PromptPacker()
+        self.eligibility_evaluator = EligibilityEvaluatorAgent(llm_for("eligibility_evaluator"),
+                                                               packer=self.packer)
+        self.comm_manager = CommunicationManagerAgent(llm_for("comm_manager"))
+
+        # Per-applicant stage checkpoints (pass a file path to resume after a crash)
+        self.state = ApplicationStateStore(state_path)
+        # Stage re-runs vs checkpoint reuse, and the LLM calls reuse saved
+        self.stage_stats = {"run": 0, "reused": 0, "llm_calls": 0, "llm_calls_saved": 0}
+        self._stage_stats_lock = threading.Lock()
+
+        # Optional queryable record of every processed application
+        self.results = ResultsStore(results_path) if results_path else None
 
         print("\n" + "=" * 70)
         print(" " * 15 + "✅ SYSTEM FULLY OPERATIONAL")
@@ -333,11 +1112,92 @@ class AdmissionOrchestrator:
         else:
             return {"error": "Unknown request type"}
 
-    def process_application(self, application_data: dict) -> dict:
+    def _count_stage(self, counter: str, amount: int = 1):
+        with self._stage_stats_lock:
+            self.stage_stats[counter] += amount
+
+    def run_stage(self, applicant_id: str, stage: str, func, inputs=None, completed=None):
+        """
+        Run one pipeline stage for an applicant, reusing its checkpoint
+        if that stage already completed in an earlier run.
+
+        inputs is everything the stage depends on; when given, the
+        checkpoint is only reused if its inputs fingerprint still matches.
+        completed(output) says whether the output is a real result; raw-text
+        fallbacks of failed JSON stages are returned but not checkpointed,
+        so a resumed run retries them (default: the output is a dict).
+        """
+        input_hash = fingerprint(inputs) if inputs is not None else None
+        checkpoint = self.state.load_checkpoint(applicant_id, stage)
+        active = current_span()
+        if checkpoint is not None and (input_hash is None or checkpoint["input_hash"] == input_hash):
+            print(f"{Colors.CYAN}  ↺ Reusing checkpointed {stage} for {applicant_id}{Colors.RESET}")
+            self._count_stage("reused")
+            self._count_stage("llm_calls_saved", checkpoint["llm_calls"])
+            if active is not None:
+                active[1]["checkpoint"] = True
+                active[1]["llm_calls_saved"] = checkpoint["llm_calls"]
+            return checkpoint["output"]
+        if checkpoint is not None:
+            print(f"{Colors.YELLOW}  ↻ Inputs of {stage} changed for {applicant_id}, re-running{Colors.RESET}")
+
+        # LLM calls are counted on the active trace span (a private one if none)
+        if active is None:
+            with RunTrace(applicant_id).stage(stage) as span:
+                output = func()
+            llm_calls = span["llm_calls"]
+        else:
+            span = active[1]
+            calls_before = span["llm_calls"]
+            output = func()
+            llm_calls = span["llm_calls"] - calls_before
+
+        self._count_stage("run")
+        self._count_stage("llm_calls", llm_calls)
+        if not (completed or is_structured)(output):
+            print(f"{Colors.YELLOW}  ⚠ {stage} for {applicant_id} failed to parse; not checkpointed{Colors.RESET}")
+            return output
+        self.state.save_stage(applicant_id, stage, output, input_hash=input_hash, llm_calls=llm_calls)
+        return output
+
+    # Each stage declares its inputs: extraction depends on the documents,
+    # eligibility on the extraction and the criteria, the email on the decision
+    def extraction_stage(self, applicant_id: str, documents: dict):
+        return self.run_stage(
+            applicant_id, "extracted_data",
+            lambda: self.doc_processor.extract(documents),
+            inputs=documents,
+            completed=extraction_completed
+        )
+
+    def eligibility_stage(self, applicant_id: str, extracted_data: dict):
+        return self.run_stage(
+            applicant_id, "eligibility",
+            lambda: self.eligibility_evaluator.evaluate(extracted_data),
+            inputs={"extracted_data": extracted_data, "criteria": self.eligibility_evaluator.criteria}
+        )
+
+    def notification_stage(self, applicant_id: str, email: str, eligibility):
+        return self.run_stage(
+            applicant_id, "notification",
+            lambda: self.comm_manager.notify(email, eligibility),
+            inputs={"email": email, "eligibility": eligibility}
+        )
+
+    def incremental_summary(self) -> str:
+        stats = self.stage_stats
+        return (f"{stats['run']} stages run, {stats['reused']} reused; "
+                f"{stats['llm_calls']} LLM calls made, {stats['llm_calls_saved']} saved by reuse")
+
+    def process_application(self, application_data: dict, applicant_id: str = None) -> dict:
         """
         Process application through sequential pipeline:
         Document Processing → Eligibility Evaluation → Communication
+        Timings and token counts for each stage come back under "trace".
         """
+        applicant_id = applicant_id or application_data.get("applicant_id") or application_data["email"]
+        trace = RunTrace(applicant_id)
+
         print("\n" + "🔄" * 35)
         print(" " * 15 + "APPLICATION PROCESSING PIPELINE")
         print("🔄" * 35 + "\n")
@@ -346,39 +1206,45 @@ class AdmissionOrchestrator:
         print("[STEP 1/3] 📄 DOCUMENT PROCESSING")
         dash_line = "-" * 70
         print(f"{Colors.BLUE}{dash_line}{Colors.RESET}")
-        extracted_data = self.doc_processor.extract(
-            application_data["documents"]
-        )
-        self.state["extracted_data"] = extracted_data
+        with trace.stage("extracted_data"):
+            extracted_data = self.extraction_stage(applicant_id, application_data["documents"])
         print("  ✅ Documents processed successfully\n")
 
         # STEP 2: Evaluate Eligibility
         print("[STEP 2/3] 📊 ELIGIBILITY EVALUATION")
         dash_line = "-" * 70
         print(f"{Colors.BLUE}{dash_line}{Colors.RESET}")
-        eligibility = self.eligibility_evaluator.evaluate(extracted_data)
-        self.state["eligibility"] = eligibility
+        with trace.stage("eligibility"):
+            eligibility = self.eligibility_stage(applicant_id, extracted_data)
         print("  ✅ Eligibility determined\n")
 
         # STEP 3: Send Communication
         print("[STEP 3/3] 📧 COMMUNICATION")
         dash_line = "-" * 70
         print(f"{Colors.BLUE}{dash_line}{Colors.RESET}")
-        notification = self.comm_manager.notify(
-            application_data["email"],
-            eligibility
-        )
+        with trace.stage("notification"):
+            notification = self.notification_stage(applicant_id, application_data["email"], eligibility)
+        if self.trace_path:
+            trace.write_jsonl(self.trace_path)
 
         print("🔄" * 35)
         print(" " * 10 + "✅ APPLICATION PROCESSING COMPLETE")
         print("🔄" * 35 + "\n")
 
-        return {
+        result = {
             "status": "processed",
+            "applicant_id": applicant_id,
+            "program": application_data.get("program"),
             "extracted_data": extracted_data,
             "eligibility": eligibility,
-            "notification_sent": True
+            "decision": notification.get("decision"),
+            "notification_sent": notification.get("sent", True),
+            "trace": trace.to_dict()
         }
+        if self.results is not None:
+            self.results.save_result(result, email=application_data.get("email"),
+                                     program=application_data.get("program"))
+        return result
 
 
 def format_json_field(key, value, indent=2):
@@ -434,14 +1300,14 @@ def format_result_output(result):
         # Transcript
         if "transcript" in extracted:
             print(f"\n{Colors.YELLOW}📋 Transcript Information:{Colors.RESET}")
-            try:
-                transcript_data = json.loads(extracted["transcript"])
+            transcript_data = parse_json_block(extracted["transcript"])
+            if transcript_data is not None:
                 print(f"  {Colors.CYAN}GPA:{Colors.RESET} {transcript_data.get('gpa', 'N/A')}")
                 print(f"  {Colors.CYAN}Graduation Year:{Colors.RESET} {transcript_data.get('graduation_year', 'N/A')}")
                 print(f"  {Colors.CYAN}Subjects:{Colors.RESET}")
                 for subject in transcript_data.get('subjects', []):
                     print(f"    • {subject}")
-            except (json.JSONDecodeError, KeyError):
+            else:
                 print(f"  {extracted['transcript']}")
 
         # Recommendation
@@ -455,26 +1321,16 @@ def format_result_output(result):
         # Essay
         if "essay" in extracted:
             print(f"\n{Colors.YELLOW}✍️  Essay Analysis:{Colors.RESET}")
-            essay_text = extracted["essay"]
-            # Try to extract JSON from the essay analysis
-            try:
-                # Find JSON block in the text
-                json_start = essay_text.find('{')
-                json_end = essay_text.rfind('}') + 1
-                if json_start != -1 and json_end > json_start:
-                    essay_data = json.loads(essay_text[json_start:json_end])
-                    print(f"  {Colors.CYAN}Main Themes:{Colors.RESET}")
-                    for theme in essay_data.get('main_themes', []):
-                        print(f"    • {theme}")
-                    print(f"  {Colors.CYAN}Writing Quality:{Colors.RESET} {essay_data.get('writing_quality', 'N/A')}/10")
-                    print(f"  {Colors.CYAN}Authenticity:{Colors.RESET} {essay_data.get('authenticity', 'N/A')}/10")
-                else:
-                    # No JSON found, print as is
-                    for line in essay_text.split('\n'):
-                        if line.strip():
-                            print(f"  {line}")
-            except (json.JSONDecodeError, KeyError):
-                for line in essay_text.split('\n'):
+            essay_data = parse_json_block(extracted["essay"])
+            if essay_data is not None:
+                print(f"  {Colors.CYAN}Main Themes:{Colors.RESET}")
+                for theme in essay_data.get('main_themes', []):
+                    print(f"    • {theme}")
+                print(f"  {Colors.CYAN}Writing Quality:{Colors.RESET} {essay_data.get('writing_quality', 'N/A')}/10")
+                print(f"  {Colors.CYAN}Authenticity:{Colors.RESET} {essay_data.get('authenticity', 'N/A')}/10")
+            else:
+                # No JSON found, print as is
+                for line in str(extracted["essay"]).split('\n'):
                     if line.strip():
                         print(f"  {line}")
 
@@ -485,64 +1341,55 @@ def format_result_output(result):
         print(f"{Colors.BLUE}{Colors.BOLD}🎯 ELIGIBILITY DECISION{Colors.RESET}")
         print(f"{Colors.BLUE}{'-' * 70}{Colors.RESET}")
 
-        eligibility_text = result["eligibility"]
-        try:
-            # Try to extract JSON from eligibility text
-            json_start = eligibility_text.find('{')
-            json_end = eligibility_text.rfind('}') + 1
-            if json_start != -1 and json_end > json_start:
-                eligibility_data = json.loads(eligibility_text[json_start:json_end])
-
-                eligible = eligibility_data.get('eligible', False)
-                score = eligibility_data.get('score', 0)
-
-                # Decision
-                if eligible:
-                    print(f"\n  {Colors.GREEN}{Colors.BOLD}✅ ELIGIBLE FOR ADMISSION{Colors.RESET}")
-                else:
-                    print(f"\n  {Colors.RED}{Colors.BOLD}❌ NOT ELIGIBLE{Colors.RESET}")
-
-                # Score
-                print(f"\n  {Colors.CYAN}Overall Score:{Colors.RESET} {score}/100")
-
-                # Progress bar
-                bar_length = 40
-                filled = int(bar_length * score / 100)
-                bar = '█' * filled + '░' * (bar_length - filled)
-                bar_color = Colors.GREEN if score >= 70 else Colors.YELLOW if score >= 50 else Colors.RED
-                print(f"  {bar_color}[{bar}]{Colors.RESET} {score}%")
-
-                # Strengths
-                if eligibility_data.get('strengths'):
-                    print(f"\n  {Colors.GREEN}{Colors.BOLD}💪 Strengths:{Colors.RESET}")
-                    for strength in eligibility_data['strengths']:
-                        print(f"    ✓ {strength}")
-
-                # Weaknesses
-                if eligibility_data.get('weaknesses') and len(eligibility_data['weaknesses']) > 0:
-                    print(f"\n  {Colors.YELLOW}{Colors.BOLD}⚠️  Areas for Improvement:{Colors.RESET}")
-                    for weakness in eligibility_data['weaknesses']:
-                        print(f"    • {weakness}")
-
-                # Reasoning
-                if eligibility_data.get('reasoning'):
-                    print(f"\n  {Colors.CYAN}{Colors.BOLD}📋 Reasoning:{Colors.RESET}")
-                    reasoning = eligibility_data['reasoning']
-                    if isinstance(reasoning, list):
-                        for reason in reasoning:
-                            print(f"    • {reason}")
-                    else:
-                        for line in str(reasoning).split('\n'):
-                            if line.strip():
-                                print(f"    {line}")
+        eligibility_data = parse_json_block(result["eligibility"])
+        if eligibility_data is not None:
+            eligible = eligibility_data.get('eligible', False)
+            score = eligibility_data.get('score', 0)
+            if not isinstance(score, (int, float)):
+                score = 0
+
+            # Decision
+            if eligible:
+                print(f"\n  {Colors.GREEN}{Colors.BOLD}✅ ELIGIBLE FOR ADMISSION{Colors.RESET}")
             else:
-                # No JSON found, display as text
-                for line in eligibility_text.split('\n'):
-                    if line.strip():
-                        print(f"  {line}")
-        except (json.JSONDecodeError, KeyError) as e:
-            # Fallback to plain text display
-            for line in eligibility_text.split('\n'):
+                print(f"\n  {Colors.RED}{Colors.BOLD}❌ NOT ELIGIBLE{Colors.RESET}")
+
+            # Score
+            print(f"\n  {Colors.CYAN}Overall Score:{Colors.RESET} {score}/100")
+
+            # Progress bar
+            bar_length = 40
+            filled = int(bar_length * score / 100)
+            bar = '█' * filled + '░' * (bar_length - filled)
+            bar_color = Colors.GREEN if score >= 70 else Colors.YELLOW if score >= 50 else Colors.RED
+            print(f"  {bar_color}[{bar}]{Colors.RESET} {score}%")
+
+            # Strengths
+            if eligibility_data.get('strengths'):
+                print(f"\n  {Colors.GREEN}{Colors.BOLD}💪 Strengths:{Colors.RESET}")
+                for strength in eligibility_data['strengths']:
+                    print(f"    ✓ {strength}")
+
+            # Weaknesses
+            if eligibility_data.get('weaknesses') and len(eligibility_data['weaknesses']) > 0:
+                print(f"\n  {Colors.YELLOW}{Colors.BOLD}⚠️  Areas for Improvement:{Colors.RESET}")
+                for weakness in eligibility_data['weaknesses']:
+                    print(f"    • {weakness}")
+
+            # Reasoning
+            if eligibility_data.get('reasoning'):
+                print(f"\n  {Colors.CYAN}{Colors.BOLD}📋 Reasoning:{Colors.RESET}")
+                reasoning = eligibility_data['reasoning']
+                if isinstance(reasoning, list):
+                    for reason in reasoning:
+                        print(f"    • {reason}")
+                else:
+                    for line in str(reasoning).split('\n'):
+                        if line.strip():
+                            print(f"    {line}")
+        else:
+            # No JSON found, display as text
+            for line in str(result["eligibility"]).split('\n'):
                 if line.strip():
                     print(f"  {line}")
 
@@ -551,6 +1398,19 @@ def format_result_output(result):
     # Notification Status
     if result.get("notification_sent"):
         print(f"{Colors.GREEN}✅ Notification email has been sent{Colors.RESET}")
+    elif result.get("decision") == "manual_review":
+        print(f"{Colors.YELLOW}⚠️  No email sent: flagged for manual review{Colors.RESET}")
+
+    # Stage timings
+    if result.get("trace"):
+        print(f"\n{Colors.CYAN}{Colors.BOLD}⏱️  Stage Timings:{Colors.RESET}")
+        for span in result["trace"]["stages"]:
+            line = f"  {span['stage']:<16} {span['wall_s']:>6.2f}s  {span['llm_calls']} LLM calls"
+            if span["completion_tokens"]:
+                line += f", {span['prompt_tokens']}→{span['completion_tokens']} tokens"
+            if span.get("checkpoint"):
+                line += " (checkpoint)"
+            print(line)
 
     print(f"\n{Colors.MAGENTA}{Colors.BOLD}{'=' * 70}{Colors.RESET}\n")
 
@@ -640,6 +1500,7 @@ def main():
 
 Commands:
    'info'  - Show available information
+   'status' - Show model warm-up, query fast path and answer cache hits
    'file'  - Load application from files (RECOMMENDED)
    'apply' - Type application manually
    'quit'  - Exit the system
@@ -663,6 +1524,19 @@ Commands:
                 system.query_handler.show_available_info()
                 continue
 
+            elif user_input.lower() == 'status':
+                status = system.warmup.summary() if system.warmup else "warm-up disabled"
+                print(f"\n{Colors.CYAN}⏱️  Model: {status}{Colors.RESET}")
+                print(f"{Colors.CYAN}💬 Queries: {system.query_handler.summary()}{Colors.RESET}")
+                if system.query_handler.answer_cache is not None:
+                    print(f"{Colors.CYAN}🧠 Semantic cache: {system.query_handler.answer_cache.summary()}{Colors.RESET}")
+                if system.single_flight is not None:
+                    print(f"{Colors.CYAN}🔗 Single-flight: {system.single_flight.summary()}{Colors.RESET}")
+                if system.packer.prompts:
+                    print(f"{Colors.CYAN}📦 Prompt packing: {system.packer.summary()}{Colors.RESET}")
+                print()
+                continue
+
             elif user_input.lower() == 'file':
                 print(f"\n{Colors.YELLOW}{'=' * 70}{Colors.RESET}")
                 print(" " * 20 + "📁 LOAD FROM FILES")
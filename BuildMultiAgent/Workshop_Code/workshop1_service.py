@@ -0,0 +1,245 @@
+"""
+Session 12 - Workshop 1: HTTP Service Mode for the Admission System
+Puts AdmissionOrchestrator.route_request behind an asyncio HTTP server
+
+Endpoints:
+    GET  /health                  → {"status": "ok", ...}
+    POST /query                   → {"answer": ...}  (synchronous)
+    POST /applications            → 202 {"job_id": ..., "status": "queued"}
+    GET  /applications/<job_id>   → {"status": queued|running|done|failed, "result": ...}
+                                    (finished jobs expire: --job-ttl, --max-jobs)
+
+Standard library only, so it can be load-tested on one box:
+    python workshop1_service.py --port 8080 --llm-concurrency 2
+    python workshop1_service.py --llm-slots 4    # queries get priority over applications
+    python workshop1_service.py --faq workshop1_sample_data/faq.json
+    curl -X POST localhost:8080/query -d '{"query": "What is the fee?"}'
+
+Using: Meta's Llama 3.2 8B via Ollama
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+from llm_client import get_pool
+from llm_scheduler import PriorityScheduler
+from workshop1_interactive_with_files import AdmissionOrchestrator, Colors
+
+REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class AdmissionService:
+    """
+    Async front end for one AdmissionOrchestrator.
+    Blocking agent calls run in worker threads; a semaphore per LLM backend
+    bounds how many of them are in flight at once. When the orchestrator
+    has a priority scheduler, queries skip that semaphore and rely on the
+    scheduler's interactive slots instead of queueing behind applications.
+    Finished jobs are kept for job_ttl_s seconds, and at most max_jobs of
+    them, oldest dropped first; queued and running jobs are never dropped.
+    """
+
+    def __init__(self, system, llm_concurrency: int = 2, job_ttl_s: float = 3600.0, max_jobs: int = 1000):
+        self.system = system
+        self.llm_concurrency = llm_concurrency
+        self.job_ttl_s = job_ttl_s
+        self.max_jobs = max_jobs
+        self._backend_limits = {}
+        self._tasks = set()  # Keep background jobs referenced until they finish
+        self.jobs = {}
+        self._finished = OrderedDict()  # job_id -> monotonic finish time, oldest first
+
+    def _limit_for(self, llm) -> asyncio.Semaphore:
+        backend = getattr(llm, "base_url", None) or "default"
+        if backend not in self._backend_limits:
+            self._backend_limits[backend] = asyncio.Semaphore(self.llm_concurrency)
+        return self._backend_limits[backend]
+
+    async def _call(self, func, *args):
+        async with self._limit_for(self.system.llm):
+            return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    def _prune_jobs(self):
+        """Drop finished jobs past their TTL, then the oldest beyond max_jobs"""
+        now = time.monotonic()
+        while self._finished:
+            job_id, finished = next(iter(self._finished.items()))
+            if now - finished <= self.job_ttl_s and len(self._finished) <= self.max_jobs:
+                break
+            del self._finished[job_id]
+            self.jobs.pop(job_id, None)
+
+    async def handle_query(self, body: dict):
+        query = body.get("query")
+        if not isinstance(query, str) or not query.strip():
+            return 400, {"error": "'query' must be a non-empty string"}
+        if getattr(self.system, "scheduler", None) is not None:
+            answer = await asyncio.get_running_loop().run_in_executor(
+                None, self.system.route_request, "query", query
+            )
+        else:
+            answer = await self._call(self.system.route_request, "query", query)
+        return 200, {"answer": answer}
+
+    async def submit_application(self, body: dict):
+        if "email" not in body or "documents" not in body:
+            return 400, {"error": "Application needs 'email' and 'documents'"}
+        if not isinstance(body["documents"], dict):
+            return 400, {"error": "'documents' must be an object of document type to text"}
+        self._prune_jobs()
+        job_id = uuid.uuid4().hex
+        self.jobs[job_id] = {"job_id": job_id, "status": "queued",
+                             "submitted_at": datetime.now().isoformat()}
+        task = asyncio.get_running_loop().create_task(self._run_application(job_id, body))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return 202, {"job_id": job_id, "status": "queued"}
+
+    async def _run_application(self, job_id: str, application: dict):
+        job = self.jobs[job_id]
+        try:
+            async with self._limit_for(self.system.llm):
+                job["status"] = "running"
+                job["result"] = await asyncio.get_running_loop().run_in_executor(
+                    None, self.system.route_request, "application", application
+                )
+            job["status"] = "done"
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = str(e)
+        job["finished_at"] = datetime.now().isoformat()
+        self._finished[job_id] = time.monotonic()
+        self._prune_jobs()
+
+    def application_status(self, job_id: str):
+        self._prune_jobs()
+        job = self.jobs.get(job_id)
+        if job is None:
+            return 404, {"error": f"Unknown job {job_id}"}
+        return 200, job
+
+    async def dispatch(self, method: str, path: str, body):
+        if method == "POST" and not isinstance(body, dict):
+            return 400, {"error": "Body must be a JSON object"}
+        if path == "/health" and method == "GET":
+            health = {"status": "ok", "jobs": len(self.jobs)}
+            if getattr(self.system, "scheduler", None) is not None:
+                health["scheduler"] = self.system.scheduler.stats()
+            if getattr(self.system, "single_flight", None) is not None:
+                health["single_flight"] = dict(self.system.single_flight.stats)
+            if self.system.query_handler.answer_cache is not None:
+                health["semantic_cache"] = dict(self.system.query_handler.answer_cache.stats)
+            return 200, health
+        if path == "/query":
+            return await self.handle_query(body) if method == "POST" else (405, {"error": "Use POST"})
+        if path == "/applications":
+            return await self.submit_application(body) if method == "POST" else (405, {"error": "Use POST"})
+        if path.startswith("/applications/"):
+            if method != "GET":
+                return 405, {"error": "Use GET"}
+            return self.application_status(path[len("/applications/"):])
+        return 404, {"error": f"No route for {path}"}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").strip()
+            if not request_line:
+                return
+            method, target, _ = request_line.split(" ", 2)
+
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length", 0))
+            if length > MAX_BODY_BYTES:
+                status, payload = 413, {"error": "Request body too large"}
+            else:
+                raw = await reader.readexactly(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else {}
+                    status, payload = await self.dispatch(method.upper(), target.split("?", 1)[0], body)
+                except json.JSONDecodeError:
+                    status, payload = 400, {"error": "Body must be JSON"}
+                except Exception as e:
+                    status, payload = 500, {"error": str(e)}
+
+            data = json.dumps(payload).encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: close\r\n\r\n".encode("latin-1") + data
+            )
+            await writer.drain()
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"{Colors.GREEN}✅ Admission service listening on http://{host}:{port}{Colors.RESET}")
+        print(f"   LLM concurrency per backend: {self.llm_concurrency}\n")
+        async with server:
+            await server.serve_forever()
+
+
+def llm_slots(value: str) -> int:
+    """argparse type for --llm-slots: 0 (off) or at least 2"""
+    slots = int(value)
+    if slots != 0 and slots < 2:
+        raise argparse.ArgumentTypeError("needs at least 2 slots (one is reserved for queries), or 0 to disable")
+    return slots
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the admission system as an HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--llm-concurrency", type=int, default=2,
+                        help="Max concurrent requests per LLM backend")
+    parser.add_argument("--llm-slots", type=llm_slots, default=0,
+                        help="Enable the priority scheduler with this many LLM slots "
+                             "(at least 2, one reserved for queries; capped at OLLAMA_NUM_PARALLEL)")
+    parser.add_argument("--faq", default=None,
+                        help="FAQ entries from this JSON/CSV file, e.g. workshop1_sample_data/faq.json")
+    parser.add_argument("--job-ttl", type=float, default=3600.0,
+                        help="Seconds a finished application job stays available")
+    parser.add_argument("--max-jobs", type=int, default=1000,
+                        help="Most finished application jobs kept (oldest dropped first)")
+    args = parser.parse_args()
+
+    scheduler = None
+    if args.llm_slots:
+        # Slots beyond the pool's in-flight limit would queue FIFO in the pool,
+        # behind batch calls, and the scheduler's priority would be lost
+        pool_size = get_pool().max_in_flight
+        if pool_size < 2:
+            parser.error(f"--llm-slots needs OLLAMA_NUM_PARALLEL >= 2 (it is {pool_size})")
+        slots = min(args.llm_slots, pool_size)
+        if slots < args.llm_slots:
+            print(f"{Colors.YELLOW}--llm-slots {args.llm_slots} capped at the Ollama pool size {pool_size}{Colors.RESET}")
+        scheduler = PriorityScheduler(max_concurrency=slots)
+    service = AdmissionService(AdmissionOrchestrator(scheduler=scheduler, faq_path=args.faq),
+                               llm_concurrency=args.llm_concurrency, job_ttl_s=args.job_ttl,
+                               max_jobs=args.max_jobs)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n\nShutting down admission service...")
+
+
+if __name__ == "__main__":
+    main()
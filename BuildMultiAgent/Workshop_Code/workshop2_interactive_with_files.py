@@ -17,11 +17,17 @@ import warnings
 warnings.filterwarnings('ignore', message='.*OpenSSL.*')
 
 from langchain.agents import initialize_agent, AgentType
-from langchain_community.llms import Ollama
 from langchain.tools import Tool
 import json
 from datetime import datetime
 
+from llm_cache import CachedLLM, SQLiteCache
+from llm_cassette import CassetteLLM
+from llm_client import create_llm
+from llm_singleflight import SingleFlight, SingleFlightLLM
+from prompt_packing import PromptPacker
+from llm_warmup import ModelWarmUp
+
 # ANSI color codes for better visibility on white backgrounds
 class Colors:
     BLUE = '\033[94m'       # Blue - for info
@@ -507,9 +513,11 @@ class ProgressMonitor:
     Provides feedback loop
     """
 
-    def __init__(self, llm):
+    def __init__(self, llm, packer: PromptPacker = None):
         print(f"{Colors.BLUE}  [Agent Progress Monitor] Initializing Progress Monitor...{Colors.RESET}")
         self.llm = llm
+        # Serialization of the completed items; opt in with PromptPacker({"progress": "kv"})
+        self.packer = packer if packer is not None else PromptPacker()
         self.student_progress = {}
         print(f"{Colors.CYAN}     ✓ Progress Monitor ready{Colors.RESET}")
 
@@ -535,7 +543,7 @@ Expected: {original_plan["months"][current_month-1]["topics"]}
 Milestone: {original_plan["months"][current_month-1]["milestone"]}
 
 COMPLETED SO FAR:
-{json.dumps(progress, indent=2)}
+{self.packer.pack("progress", progress)}
 
 Determine:
 1. Status: ahead/on_track/behind/struggling
@@ -643,20 +651,60 @@ class LearningPathSystem:
     Orchestrates all agents with feedback loops
     """
 
-    def __init__(self):
+    # Agents that call llm.invoke directly and can share the response cache.
+    # The Skills Assessment agent is a LangChain ReAct agent and needs the raw LLM.
+    CACHEABLE_AGENTS = ("planner", "recommender", "monitor")
+
+    def __init__(self, cached_agents: tuple = (), cache_path: str = "llm_cache.sqlite",
+                 cassette_path: str = None, cassette_mode: str = "replay",
+                 warm_up: bool = True, keep_alive: str = "30m", single_flight: bool = True,
+                 packer: PromptPacker = None):
         print(f"\n{Colors.CYAN}{Colors.BOLD}🔧 Initializing Learning Path System...{Colors.RESET}")
         print(f"{Colors.BLUE}{'-' * 70}{Colors.RESET}")
 
         # Initialize Llama 3.2 (shared)
         print("\n[Core] Connecting to Meta's Llama 3.2 via Ollama...")
-        llm = Ollama(model="llama3.2", temperature=0.7)
+        llm = create_llm(model="llama3.2", temperature=0.7, keep_alive=keep_alive)
         print("  ✓ Llama 3.2 8B connected")
 
+        # Load the model now, in the background, instead of on the first request
+        self.warmup = None
+        if warm_up and not (cassette_path and cassette_mode == "replay"):
+            self.warmup = ModelWarmUp(llm, keep_alive=keep_alive).start()
+            print(f"  ✓ Model warm-up started in the background (keep_alive {keep_alive})")
+
+        # Optional record/replay of every LLM call (replay needs no running model)
+        self.cassette_llm = None
+        if cassette_path:
+            llm = self.cassette_llm = CassetteLLM.wrap(llm, cassette_path, mode=cassette_mode)
+            print(f"  ✓ Cassette {cassette_path} ({cassette_mode} mode, {len(llm.cassette)} recorded calls)")
+
+        # Students onboarded together send identical prompts: share one generation
+        self.single_flight = None
+        if single_flight:
+            self.single_flight = SingleFlight()
+            llm = SingleFlightLLM.wrap(llm, self.single_flight)
+            print("  ✓ Single-flight: identical in-flight prompts share one generation")
+
+        # Optional response cache, opted into per agent
+        unknown = set(cached_agents) - set(self.CACHEABLE_AGENTS)
+        if unknown:
+            raise ValueError(f"Cannot cache agents: {', '.join(sorted(unknown))}")
+        self.cached_llm = None
+        if cached_agents:
+            self.cached_llm = CachedLLM(llm, disk_cache=SQLiteCache(cache_path))
+            print(f"  ✓ Response cache enabled for: {', '.join(cached_agents)}")
+
+        def llm_for(agent_name):
+            return self.cached_llm if agent_name in cached_agents else llm
+
         print("\n[Sub-Agents] Initializing specialized agents...")
         self.skills_agent = SkillsAssessmentAgent(llm)
-        self.planner = LearningPathPlanner(llm)
-        self.recommender = ContentRecommender(llm)
-        self.monitor = ProgressMonitor(llm)
+        self.planner = LearningPathPlanner(llm_for("planner"))
+        self.recommender = ContentRecommender(llm_for("recommender"))
+        # Optional compact serialization of prompt inputs, opted into per prompt
+        self.packer = packer if packer is not None else PromptPacker()
+        self.monitor = ProgressMonitor(llm_for("monitor"), packer=self.packer)
 
         print("\n" + "=" * 70)
         print(" " * 15 + "✅ SYSTEM FULLY OPERATIONAL")
@@ -791,6 +839,7 @@ def main():
 Commands:
    'load'   - Load profile from file (RECOMMENDED)
    'manual' - Enter profile manually
+   'status' - Show model warm-up (load vs inference time)
    'quit'   - Exit the system
 """)
 
@@ -808,6 +857,16 @@ Commands:
                 print("   Continue your learning journey!\n")
                 break
 
+            elif user_input == 'status':
+                status = system.warmup.summary() if system.warmup else "warm-up disabled"
+                print(f"\n{Colors.CYAN}⏱️  Model: {status}{Colors.RESET}")
+                if system.single_flight is not None:
+                    print(f"{Colors.CYAN}🔗 Single-flight: {system.single_flight.summary()}{Colors.RESET}")
+                if system.packer.prompts:
+                    print(f"{Colors.CYAN}📦 Prompt packing: {system.packer.summary()}{Colors.RESET}")
+                print()
+                continue
+
             elif user_input == 'load':
                 print(f"\n{Colors.YELLOW}{'=' * 70}{Colors.RESET}")
                 print(" " * 20 + "📁 LOAD STUDENT PROFILE")
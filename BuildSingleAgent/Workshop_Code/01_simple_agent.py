@@ -12,7 +12,7 @@ What this demonstrates:
 import warnings
 warnings.filterwarnings('ignore', message='.*OpenSSL.*')
 
-from langchain_community.llms import Ollama
+from llm_client import create_llm  # Pooled, keep-alive Ollama client
 from langchain.prompts import PromptTemplate
 
 # ANSI color codes for better visibility on white backgrounds
@@ -32,7 +32,7 @@ print("-" * 60)
 
 # Step 1: Initialize Llama 3.2 through Ollama
 print(f"\n{Colors.BLUE}[1/3] Connecting to Llama 3.2 via Ollama...{Colors.RESET}")
-llm = Ollama(
+llm = create_llm(
     model="llama3.2",  # Meta's Llama 3.2 model
     temperature=0.7
 )
@@ -13,7 +13,7 @@ import warnings
 warnings.filterwarnings('ignore', message='.*OpenSSL.*')
 
 from langchain.agents import initialize_agent, AgentType
-from langchain_community.llms import Ollama
+from llm_client import create_llm  # Pooled, keep-alive Ollama client
 from langchain_community.tools import DuckDuckGoSearchRun
 from langchain_community.tools import WikipediaQueryRun
 from langchain_community.utilities import WikipediaAPIWrapper
@@ -36,7 +36,7 @@ print("-" * 60)
 
 # Step 1: Initialize Llama 3.2
 print(f"\n{Colors.BLUE}[1/4] Initializing Llama 3.2 via Ollama...{Colors.RESET}")
-llm = Ollama(
+llm = create_llm(
     model="llama3.2",
     temperature=0.7,
     stop=["Observation:", "\nObservation"]  # Help prevent loops
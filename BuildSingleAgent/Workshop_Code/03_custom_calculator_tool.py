@@ -14,7 +14,7 @@ warnings.filterwarnings('ignore', message='.*OpenSSL.*')
 
 from langchain.tools import Tool
 from langchain.agents import initialize_agent, AgentType
-from langchain_community.llms import Ollama
+from llm_client import create_llm  # Pooled, keep-alive Ollama client
 import re
 
 # ANSI color codes for better visibility on white backgrounds
@@ -57,7 +57,7 @@ print("-" * 60)
 
 # Step 1: Initialize Llama 3.2
 print(f"\n{Colors.BLUE}[1/3] Initializing Llama 3.2...{Colors.RESET}")
-llm = Ollama(
+llm = create_llm(
     model="llama3.2",
     temperature=0  # Use 0 for math - we want deterministic results
 )
@@ -14,7 +14,7 @@ warnings.filterwarnings('ignore', message='.*OpenSSL.*')
 
 from langchain.memory import ConversationBufferMemory
 from langchain.chains import ConversationChain
-from langchain_community.llms import Ollama
+from llm_client import create_llm  # Pooled, keep-alive Ollama client
 from langchain.prompts import PromptTemplate
 
 # ANSI color codes for better visibility on white backgrounds
@@ -34,7 +34,7 @@ print("-" * 60)
 
 # Step 1: Initialize Llama 3.2
 print(f"\n{Colors.BLUE}[1/3] Initializing Llama 3.2...{Colors.RESET}")
-llm = Ollama(
+llm = create_llm(
     model="llama3.2",
     temperature=0.7
     # Note: stop parameter removed for conversational agent compatibility
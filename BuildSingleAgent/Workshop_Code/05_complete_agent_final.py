@@ -15,7 +15,7 @@ warnings.filterwarnings('ignore', message='.*OpenSSL.*')
 
 from langchain.agents import initialize_agent, AgentType
 from langchain.memory import ConversationBufferMemory
-from langchain_community.llms import Ollama
+from llm_client import create_llm  # Pooled, keep-alive Ollama client
 from langchain_community.tools import DuckDuckGoSearchRun, WikipediaQueryRun
 from langchain_community.utilities import WikipediaAPIWrapper
 from langchain.tools import Tool
@@ -77,7 +77,7 @@ print("\n" + "-" * 70)
 
 # Step 1: Initialize Llama 3.2
 print(f"\n{Colors.BLUE}[1/6] Initializing Meta's Llama 3.2 via Ollama...{Colors.RESET}")
-llm = Ollama(
+llm = create_llm(
     model="llama3.2",  # Meta's open-source model
     temperature=0.7
 )
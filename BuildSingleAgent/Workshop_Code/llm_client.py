@@ -0,0 +1,44 @@
+"""
+Session 11 - Workshop Code: Pooled Ollama Client
+Loads the shared client so both sessions run the same code
+
+The implementation (keep-alive pool, in-flight limit, create_llm) lives in
+BuildMultiAgent/Workshop_Code/llm_client.py. Fix it there; this module only
+makes it importable from the Session 11 folder.
+
+Dependency: this folder needs the Session 12 code next to it, as in the
+repository (../../BuildMultiAgent/Workshop_Code). If you copy Session 11
+somewhere else, set SESSION12_CODE_DIR to the folder holding llm_client.py.
+
+Usage:
+    from llm_client import create_llm
+    llm = create_llm(model="llama3.2", temperature=0.7)
+"""
+
+import importlib.util
+import os
+import sys
+
+_SHARED_DIR = os.environ.get("SESSION12_CODE_DIR") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "BuildMultiAgent", "Workshop_Code"
+)
+_SHARED_PATH = os.path.normpath(os.path.join(_SHARED_DIR, "llm_client.py"))
+
+if not os.path.isfile(_SHARED_PATH):
+    raise ImportError(
+        f"Session 11's llm_client uses the shared Session 12 client, which was not found at {_SHARED_PATH}. "
+        "Keep BuildMultiAgent/Workshop_Code next to BuildSingleAgent, or set SESSION12_CODE_DIR "
+        "to the folder that holds llm_client.py."
+    )
+
+# Registered under its own name so it cannot shadow (or be shadowed by) this module
+_spec = importlib.util.spec_from_file_location("session12_llm_client", _SHARED_PATH)
+_shared = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = _shared
+_spec.loader.exec_module(_shared)
+
+OllamaPool = _shared.OllamaPool
+PooledOllama = _shared.PooledOllama
+create_llm = _shared.create_llm
+get_pool = _shared.get_pool
+pool_stats = _shared.pool_stats